@@ -0,0 +1,3 @@
+"""
+Benchmarks for the invoice conversion pipeline
+"""
\ No newline at end of file
@@ -0,0 +1,84 @@
+"""
+Parse throughput benchmark for the generic parser and each registered vendor parser
+
+Synthetic invoice text is parsed once with the generic rules and once per
+registered vendor. Besides the built-in vendors, the synthetic supplier from
+synthetic_invoices is registered with the lean structured-row parser.
+
+Examples:
+    python -m benchmarks.bench_parsers --pages 50 --rows 40 --repeat 5
+"""
+import argparse
+import time
+
+from benchmarks.synthetic_invoices import generate_invoice
+from src.text_processing.processor import parse_invoice_text, parse_structured_line
+from src.text_processing.vendors import GENERIC_VENDOR, VENDORS, register_vendor
+
+SYNTHETIC_VENDOR = 'synthetic'
+
+
+def build_text(pages, rows, seed=0):
+    """
+    Build extracted-looking text for a synthetic invoice
+
+    Returns:
+        tuple: (text with page markers, expected items)
+    """
+    page_lines, expected = generate_invoice(pages=pages, rows=rows, seed=seed)
+    text = "".join(
+        f"\n=== Page {page_num} ===\n" + "\n".join(lines) + "\n"
+        for page_num, lines in enumerate(page_lines, 1)
+    )
+    return text, expected
+
+
+def time_parser(text, vendor, repeat):
+    """
+    Parse the text ``repeat`` times with the given vendor
+
+    Returns:
+        tuple: (best time in seconds, parsed items)
+    """
+    best = None
+    items = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = parse_invoice_text(text, vendor=vendor)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, items
+
+
+def main(argv=None):
+    """
+    Run the benchmark from the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmark parse throughput per vendor parser")
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=40, help="Item rows per page")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per parser; the best is reported")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    if SYNTHETIC_VENDOR not in VENDORS:
+        register_vendor(SYNTHETIC_VENDOR, r"SYNTHETIC FOODS DISTRIBUTION", parse_structured_line)
+
+    text, expected = build_text(args.pages, args.rows, args.seed)
+    line_count = text.count("\n")
+
+    generic_time, generic_items = time_parser(text, GENERIC_VENDOR, args.repeat)
+    header = f"{'vendor':<14}{'lines/s':>12}{'items/s':>12}{'items':>8}{'expected':>10}{'same as generic':>17}"
+    print(header)
+    print("-" * len(header))
+    for vendor in [GENERIC_VENDOR] + list(VENDORS):
+        if vendor == GENERIC_VENDOR:
+            elapsed, items = generic_time, generic_items
+        else:
+            elapsed, items = time_parser(text, vendor, args.repeat)
+        print(f"{vendor:<14}{line_count / elapsed:>12.0f}{len(items) / elapsed:>12.0f}{len(items):>8}"
+              f"{len(expected):>10}{str(items == generic_items):>17}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
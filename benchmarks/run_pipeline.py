@@ -0,0 +1,177 @@
+"""
+End-to-end benchmark of the PDF -> items -> Excel pipeline on synthetic invoices
+
+Runs extract_text_from_pdf, parse_invoice_text and export_to_excel over
+generated invoices and reports throughput, peak memory and how many of the
+expected items were extracted correctly, so speed changes can be checked
+against accuracy. Each case runs in a fresh process, so its peak memory is
+not hidden by the cases run before it.
+
+Examples:
+    python -m benchmarks.run_pipeline --pages 1 5 20 --rows 30 --variant both
+    python -m benchmarks.run_pipeline --pages 5 --noise 0.03 --skew 2 --dpi 200 --ocr-mode adaptive
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_invoices import write_synthetic_invoice
+from src.excel_output.export import export_to_excel
+from src.pdf_extraction.extractor import extract_text_from_pdf
+from src.pdf_extraction.ocr_profiles import DEFAULT_PROFILE, OCR_PROFILES
+from src.text_processing.processor import parse_invoice_text
+
+# Fields compared between expected and extracted items
+COMPARED_FIELDS = [
+    'Purchased', 'Received', 'Code1', 'Code2', 'Brand', 'Description', 'Product',
+    'CostPerPacket', 'TotalCost', 'BarInParanthesis'
+]
+
+
+def peak_rss_mb():
+    """
+    Peak resident memory of this process and of its finished child processes
+    (Tesseract runs as a child process)
+
+    The peaks cover the whole lifetime of the process, so this is only a per
+    case measurement inside a process started for that case.
+
+    Returns:
+        tuple: (own peak in MB, children peak in MB), None where unavailable
+    """
+    try:
+        import resource
+    except ImportError:
+        # Not available on Windows
+        return None, None
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / scale
+    return own, children
+
+
+def score_items(expected, extracted):
+    """
+    Compare extracted items with the expected ones, page by page and code by code
+
+    Args:
+        expected (list): Expected item dictionaries
+        extracted (list): Item dictionaries returned by parse_invoice_text
+
+    Returns:
+        dict: Matched item count, correct field fraction and unexpected item count
+    """
+    remaining = {}
+    for item in extracted:
+        remaining.setdefault((item.get('Page'), item['Code2']), []).append(item)
+
+    matched = 0
+    correct_fields = 0
+    for item in expected:
+        candidates = remaining.get((item['Page'], item['Code2']))
+        if not candidates:
+            continue
+        found = candidates.pop(0)
+        matched += 1
+        correct_fields += sum(found.get(field) == item[field] for field in COMPARED_FIELDS)
+
+    return {
+        'matched': matched,
+        'field_accuracy': correct_fields / (len(expected) * len(COMPARED_FIELDS)) if expected else 1.0,
+        'unexpected': sum(len(items) for items in remaining.values()),
+    }
+
+
+def run_case(pdf_path, expected, pages, extract_options):
+    """
+    Run the full pipeline over one PDF and measure it
+
+    Returns:
+        dict: Timings, throughput, memory and accuracy of the run
+    """
+    start = time.perf_counter()
+    text = extract_text_from_pdf(pdf_path, **extract_options)
+    extracted_at = time.perf_counter()
+    items = parse_invoice_text(text)
+    parsed_at = time.perf_counter()
+    excel_path = os.path.splitext(pdf_path)[0] + ".xlsx"
+    export_to_excel(items, excel_path)
+    done_at = time.perf_counter()
+
+    total = done_at - start
+    own_rss, children_rss = peak_rss_mb()
+    result = {
+        'extract_s': extracted_at - start,
+        'parse_s': parsed_at - extracted_at,
+        'export_s': done_at - parsed_at,
+        'pages_per_s': pages / total,
+        'items_per_s': len(items) / total,
+        'peak_rss_mb': own_rss,
+        'child_peak_rss_mb': children_rss,
+        'items': len(items),
+        'expected': len(expected),
+    }
+    result.update(score_items(expected, items))
+    return result
+
+
+def run_case_isolated(pdf_path, expected, pages, extract_options):
+    """
+    Run run_case in a freshly spawned process, so peak memory is measured per case
+
+    Returns:
+        dict: Result of run_case
+    """
+    with multiprocessing.get_context('spawn').Pool(1) as pool:
+        return pool.apply(run_case, (pdf_path, expected, pages, extract_options))
+
+
+def main(argv=None):
+    """
+    Run the benchmark from the command line
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the invoice pipeline on synthetic PDFs")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 5], help="Page counts to run")
+    parser.add_argument("--rows", type=int, default=30, help="Item rows per page (up to about 45 fit)")
+    parser.add_argument("--variant", choices=["image", "text", "both"], default="both")
+    parser.add_argument("--dpi", type=int, default=300, help="Scan resolution of image PDFs")
+    parser.add_argument("--noise", type=float, default=0.0, help="Fraction of noisy pixels")
+    parser.add_argument("--skew", type=float, default=0.0, help="Maximum page rotation in degrees")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ocr-mode", choices=["standard", "adaptive"], default="standard")
+    parser.add_argument("--ocr-profile", choices=list(OCR_PROFILES), default=DEFAULT_PROFILE)
+    parser.add_argument("--no-triage", action="store_true", help="OCR every scanned page")
+    parser.add_argument("--output-dir", help="Keep generated files here instead of a temporary directory")
+    args = parser.parse_args(argv)
+
+    extract_options = {'ocr_mode': args.ocr_mode, 'ocr_profile': args.ocr_profile, 'triage': not args.no_triage}
+    variants = ["text", "image"] if args.variant == "both" else [args.variant]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = args.output_dir or temp_dir
+        header = (f"{'variant':<8}{'pages':>6}{'items':>7}{'extract s':>11}{'parse s':>9}{'export s':>10}"
+                  f"{'pages/s':>9}{'items/s':>9}{'rss MB':>8}{'child MB':>10}{'matched':>9}{'fields':>8}{'extra':>7}")
+        print(header)
+        print("-" * len(header))
+        for variant in variants:
+            for pages in args.pages:
+                name = f"bench_{variant}_{pages}p_{args.rows}r_{args.dpi}dpi"
+                pdf_path, expected = write_synthetic_invoice(
+                    output_dir, name, pages=pages, rows=args.rows, variant=variant,
+                    dpi=args.dpi, noise=args.noise, skew=args.skew, seed=args.seed
+                )
+                r = run_case_isolated(pdf_path, expected, pages, extract_options)
+                rss = f"{r['peak_rss_mb']:.0f}" if r['peak_rss_mb'] is not None else "n/a"
+                child_rss = f"{r['child_peak_rss_mb']:.0f}" if r['child_peak_rss_mb'] is not None else "n/a"
+                print(f"{variant:<8}{pages:>6}{r['items']:>7}{r['extract_s']:>11.3f}{r['parse_s']:>9.3f}"
+                      f"{r['export_s']:>10.3f}{r['pages_per_s']:>9.2f}{r['items_per_s']:>9.1f}{rss:>8}"
+                      f"{child_rss:>10}{r['matched']:>5}/{r['expected']:<3}{r['field_accuracy']:>8.1%}"
+                      f"{r['unexpected']:>7}")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
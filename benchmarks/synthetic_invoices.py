@@ -0,0 +1,273 @@
+"""
+Generator for synthetic invoice PDFs with known line items
+
+Pages are laid out like the supplier invoices the parser was written for:
+a header block, a column header and rows of the form
+``3 3 CAS S15 Deep Spi Chilli Powder 7oz (12) 24.35 73.05``. Each PDF comes
+with the list of items the pipeline is expected to extract from it.
+
+Examples:
+    python -m benchmarks.synthetic_invoices --pages 5 --rows 25 --noise 0.02 --skew 1.5
+"""
+import argparse
+import json
+import os
+import random
+import re
+
+# Values chosen so that every generated row is unambiguous for the parser:
+# no brand names inside product words, no quantities that look like the
+# "1 1" OCR patterns, no "3)" the OCR fixes read as 5 and no prices that
+# collide with pack sizes.
+BRANDS = ['Deep', 'Mirch', 'Bansi', 'Sujata', 'Chandan', 'MDH']
+DESCRIPTIONS = ['Flo', 'Diges', 'Pres', 'Spi']
+PRODUCT_WORDS = [
+    'Chilli', 'Powder', 'Turmeric', 'Cumin', 'Seeds', 'Garam', 'Masala', 'Coriander',
+    'Mango', 'Pickle', 'Rice', 'Atta', 'Besan', 'Jaggery', 'Tamarind', 'Mustard',
+]
+CODE1_VALUES = ['CAS', 'PK', 'BAG']
+QUANTITIES = [1, 2, 3, 4, 5, 6, 8, 10, 12]
+PACK_SIZES = [4, 6, 7, 12, 14, 24]
+
+# Letter page size in inches
+PAGE_WIDTH_IN = 8.5
+PAGE_HEIGHT_IN = 11
+
+
+def generate_invoice(pages=1, rows=20, seed=0):
+    """
+    Generate the text lines and expected items of a synthetic invoice
+
+    Args:
+        pages (int): Number of pages
+        rows (int): Number of item rows per page
+        seed (int): Random seed, so runs are reproducible
+
+    Returns:
+        tuple: (list of per-page line lists, list of expected item dictionaries)
+    """
+    rng = random.Random(seed)
+    page_lines = []
+    expected = []
+    for page_num in range(1, pages + 1):
+        lines = [
+            "SYNTHETIC FOODS DISTRIBUTION",
+            f"Invoice Number: {rng.randint(100000, 999999)}   Invoice Date: 04/{page_num % 28 + 1:02d}/2025",
+            "Ship To: Corner Grocery, 12 Main Street",
+            "ORD SHP UNIT ITEM DESCRIPTION PRICE AMOUNT",
+        ]
+        for _ in range(rows):
+            line, item = _generate_row(rng)
+            item['Page'] = page_num
+            lines.append(line)
+            expected.append(item)
+        lines.append(f"Page {page_num} of {pages}")
+        page_lines.append(lines)
+    return page_lines, expected
+
+
+def _generate_row(rng):
+    quantity = rng.choice(QUANTITIES)
+    code1 = rng.choice(CODE1_VALUES)
+    brand = rng.choice(BRANDS)
+    description = rng.choice(DESCRIPTIONS)
+    if description == 'Spi':
+        code2 = f"S{rng.randint(10, 59)}"
+    else:
+        code2 = f"{rng.choice('ACDGKMNRTW')}{rng.choice('ACDGKMNRTW')}{rng.randint(10, 59)}"
+    words = ' '.join(rng.sample(PRODUCT_WORDS, 2))
+    size = rng.choice([4, 7, 8, 14, 16, 28])
+    bar = rng.choice(PACK_SIZES)
+    # Always use non-zero cents so prices never equal the pack size, and avoid
+    # amounts like 102.40 that the OCR unit fixes would read as "1oz"
+    while True:
+        cost = round(rng.randint(10, 59) + rng.randint(1, 99) / 100, 2)
+        total = round(cost * quantity, 2)
+        if not re.search(r'\d02\.', f"{cost:.2f} {total:.2f}"):
+            break
+
+    product = f"{words} {size}oz ({bar})"
+    line = f"{quantity} {quantity} {code1} {code2} {brand} {description} {product} {cost:.2f} {total:.2f}"
+    item = {
+        'Purchased': quantity,
+        'Received': quantity,
+        'Code1': code1,
+        'Code2': code2,
+        'Brand': brand,
+        'Description': description,
+        'Product': product,
+        'CostPerPacket': cost,
+        'TotalCost': total,
+        'BarInParanthesis': bar,
+    }
+    return line, item
+
+
+def render_page_image(lines, dpi=300, noise=0.0, skew=0.0, seed=0):
+    """
+    Render page lines as a scanned-looking grayscale image
+
+    Args:
+        lines (list): Text lines of the page
+        dpi (int): Scan resolution
+        noise (float): Fraction of pixels flipped to random gray levels
+        skew (float): Maximum rotation in degrees, applied in a random direction
+        seed (int): Random seed for noise and skew
+
+    Returns:
+        PIL.Image.Image: Page image
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    rng = random.Random(seed)
+    width, height = int(PAGE_WIDTH_IN * dpi), int(PAGE_HEIGHT_IN * dpi)
+    img = Image.new('L', (width, height), 255)
+    draw = ImageDraw.Draw(img)
+
+    font_size = max(8, int(dpi * 0.13))
+    try:
+        font = ImageFont.truetype("DejaVuSansMono.ttf", font_size)
+    except OSError:
+        font = ImageFont.load_default(size=font_size)
+
+    margin = int(0.5 * dpi)
+    line_height = int(font_size * 1.5)
+    y = margin
+    for line in lines:
+        draw.text((margin, y), line, fill=0, font=font)
+        y += line_height
+
+    if noise:
+        pixels = img.load()
+        for _ in range(int(width * height * noise)):
+            pixels[rng.randrange(width), rng.randrange(height)] = rng.randint(0, 255)
+
+    if skew:
+        img = img.rotate(rng.uniform(-skew, skew), resample=Image.BILINEAR, expand=False, fillcolor=255)
+    return img
+
+
+def write_image_pdf(page_lines, pdf_path, dpi=300, noise=0.0, skew=0.0, seed=0):
+    """
+    Write an image-only PDF, as produced by a scanner
+
+    Args:
+        page_lines (list): Per-page line lists from generate_invoice
+        pdf_path (str): Output path
+        dpi (int): Scan resolution
+        noise (float): Fraction of noisy pixels per page
+        skew (float): Maximum page rotation in degrees
+        seed (int): Random seed for noise and skew
+    """
+    images = [
+        render_page_image(lines, dpi=dpi, noise=noise, skew=skew, seed=seed + page_num)
+        for page_num, lines in enumerate(page_lines)
+    ]
+    images[0].save(pdf_path, "PDF", resolution=dpi, save_all=True, append_images=images[1:])
+
+
+def write_text_pdf(page_lines, pdf_path):
+    """
+    Write a PDF with a real text layer, as produced by invoicing software
+
+    Args:
+        page_lines (list): Per-page line lists from generate_invoice
+        pdf_path (str): Output path
+    """
+    page_count = len(page_lines)
+    # Object numbers: 1 catalog, 2 page tree, 3 font, then a page and a content stream per page
+    objects = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Courier >>",
+    }
+    kids = []
+    for index, lines in enumerate(page_lines):
+        page_obj, content_obj = 4 + index * 2, 5 + index * 2
+        kids.append(f"{page_obj} 0 R")
+        stream = ["BT", "/F1 9 Tf", "12 TL", "36 756 Td"]
+        for line in lines:
+            escaped = line.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+            stream.append(f"({escaped}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode('latin-1')
+        objects[page_obj] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_obj} 0 R >>"
+        ).encode('latin-1')
+        objects[content_obj] = b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content)
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {page_count} >>".encode('latin-1')
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = len(output)
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, objects[number])
+    xref_offset = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for number in sorted(objects):
+        output += b"%010d 00000 n \n" % offsets[number]
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset)
+
+    with open(pdf_path, 'wb') as f:
+        f.write(output)
+
+
+def write_synthetic_invoice(output_dir, name, pages=1, rows=20, variant='image', dpi=300,
+                            noise=0.0, skew=0.0, seed=0):
+    """
+    Write a synthetic invoice PDF together with its expected items
+
+    Args:
+        output_dir (str): Directory to write to
+        name (str): Base file name
+        pages (int): Number of pages
+        rows (int): Item rows per page
+        variant (str): 'image' for a scanned PDF or 'text' for a text-layer PDF
+        dpi (int): Scan resolution of the image variant
+        noise (float): Fraction of noisy pixels of the image variant
+        skew (float): Maximum page rotation in degrees of the image variant
+        seed (int): Random seed
+
+    Returns:
+        tuple: (path of the PDF, list of expected items)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    page_lines, expected = generate_invoice(pages=pages, rows=rows, seed=seed)
+    pdf_path = os.path.join(output_dir, f"{name}.pdf")
+    if variant == 'text':
+        write_text_pdf(page_lines, pdf_path)
+    else:
+        write_image_pdf(page_lines, pdf_path, dpi=dpi, noise=noise, skew=skew, seed=seed)
+
+    with open(os.path.join(output_dir, f"{name}.expected.json"), 'w', encoding='utf-8') as f:
+        json.dump(expected, f, indent=2)
+    return pdf_path, expected
+
+
+def main(argv=None):
+    """
+    Write synthetic invoices from the command line
+    """
+    parser = argparse.ArgumentParser(description="Generate synthetic invoice PDFs")
+    parser.add_argument("--output-dir", default="synthetic_invoices")
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--rows", type=int, default=20, help="Item rows per page (up to about 45 fit)")
+    parser.add_argument("--variant", choices=["image", "text", "both"], default="both")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--noise", type=float, default=0.0)
+    parser.add_argument("--skew", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    variants = ["image", "text"] if args.variant == "both" else [args.variant]
+    for variant in variants:
+        name = f"invoice_{args.pages}p_{args.rows}r_{variant}"
+        pdf_path, expected = write_synthetic_invoice(
+            args.output_dir, name, pages=args.pages, rows=args.rows, variant=variant,
+            dpi=args.dpi, noise=args.noise, skew=args.skew, seed=args.seed
+        )
+        print(f"Wrote {pdf_path} ({len(expected)} items)")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -1,13 +1,20 @@
 """
 Main converter module that ties all components together
 """
-from src.pdf_extraction.extractor import extract_text_from_pdf
-from src.text_processing.processor import parse_invoice_text
+import os
+from functools import partial
+
+from src.pdf_extraction.extractor import OCR_MODES, extract_pages
+from src.text_processing.processor import extract_invoice_date, find_skipped_pages, parse_invoice_text
+from src.text_processing.vendors import GENERIC_VENDOR, detect_vendor, first_page_text
 from src.excel_output.export import export_to_excel
 from src.gui.app import create_gui
+from src.profiling.profiler import PROFILE_LOCK, PipelineProfiler, stage_context
+from src.storage.sqlite_store import open_store, store_items
 
 
-def invoice_pdf_to_excel(pdf_path, output_excel_path, log_callback=None):
+def invoice_pdf_to_excel(pdf_path, output_excel_path, log_callback=None, profile_dir=None,
+                         db_path=None, page_callback=None, **extract_options):
     """
     Main function to process PDF and export to Excel
     
@@ -15,19 +22,64 @@ def invoice_pdf_to_excel(pdf_path, output_excel_path, log_callback=None):
         pdf_path (str): Path to the PDF file
         output_excel_path (str): Path to save Excel file
         log_callback (function, optional): Callback for logging
+        profile_dir (str, optional): Directory to write per-stage profiling data to.
+            Profiling is disabled when not set. Profiled conversions run one
+            at a time.
+        db_path (str, optional): SQLite database to also store the parsed items in
+        page_callback (function, optional): Called with (page number, number of
+            pages, items parsed from the page) as soon as each page is done
+        **extract_options: Extra options passed to extract_pages,
+            e.g. ``pages="1-3"``, ``page_cache=cache`` to reuse pages from a
+            preview, ``force_full_ocr=True`` to OCR every scanned page, or
+            ``page_timeout=60`` to bound the OCR time of each page
         
     Returns:
         bool: True if successful, False otherwise
     """
-    # Step 1: Extract text from PDF
-    if log_callback:
-        log_callback("Extracting text from PDF...")
-    text = extract_text_from_pdf(pdf_path)
+    if not profile_dir:
+        return _convert(pdf_path, output_excel_path, log_callback, None, db_path, page_callback,
+                        extract_options)
     
-    # Step 2: Parse the text to extract structured data
+    with PROFILE_LOCK:
+        run_name = os.path.splitext(os.path.basename(pdf_path))[0]
+        profiler = PipelineProfiler(profile_dir, run_name=run_name)
+        try:
+            return _convert(pdf_path, output_excel_path, log_callback, profiler, db_path, page_callback,
+                            extract_options)
+        finally:
+            summary = profiler.summary()
+            if log_callback:
+                log_callback(summary)
+
+
+def _convert(pdf_path, output_excel_path, log_callback, profiler, db_path, page_callback,
+             extract_options):
+    # Step 1 and 2: Extract text from the PDF and parse each page as it arrives.
+    # Fetching a page and parsing it are profiled as separate stages.
     if log_callback:
-        log_callback("Parsing extracted text...")
-    invoice_items = parse_invoice_text(text)
+        log_callback("Extracting and parsing text from PDF...")
+    text = ""
+    invoice_items = []
+    pages = extract_pages_with_vendor(pdf_path, log_callback=log_callback, **extract_options)
+    while True:
+        with stage_context(profiler, "extraction"):
+            extracted = next(pages, None)
+        if extracted is None:
+            break
+        page_num, total_pages, page_text, vendor = extracted
+        text += page_text
+        
+        with stage_context(profiler, "parsing"):
+            page_items = parse_invoice_text(page_text, vendor=vendor)
+        invoice_items.extend(page_items)
+        if page_callback:
+            page_callback(page_num, total_pages, page_items)
+    
+    skipped_pages = find_skipped_pages(text)
+    if skipped_pages and log_callback:
+        log_callback("Skipped pages: " + ", ".join(
+            f"{page['Page']} ({page['Reason']})" for page in skipped_pages
+        ))
     
     # Step 3: Create DataFrame and export to Excel
     if invoice_items:
@@ -37,11 +89,22 @@ def invoice_pdf_to_excel(pdf_path, output_excel_path, log_callback=None):
         if log_callback:
             log_callback("Applying Excel formatting...")
         
-        success = export_to_excel(invoice_items, output_excel_path)
+        with stage_context(profiler, "export"):
+            success = export_to_excel(invoice_items, output_excel_path, skipped_pages=skipped_pages)
         
         if success and log_callback:
             log_callback(f"Data successfully exported to {output_excel_path}")
             log_callback(f"Number of records processed: {len(invoice_items)}")
+        
+        # Step 4: Optionally keep the items in the cross-invoice database
+        if db_path:
+            conn = open_store(db_path)
+            try:
+                stored = store_items(conn, invoice_items, pdf_path, invoice_date=extract_invoice_date(text))
+            finally:
+                conn.close()
+            if log_callback:
+                log_callback(f"Stored {stored} items in {db_path}")
         return success
     else:
         if log_callback:
@@ -49,11 +112,129 @@ def invoice_pdf_to_excel(pdf_path, output_excel_path, log_callback=None):
         return False
 
 
+def extract_pages_with_vendor(pdf_path, page_cache=None, log_callback=None, **extract_options):
+    """
+    Extract pages like extract_pages, together with the supplier of the invoice
+    
+    The supplier is detected from document page 1. If the page selection does
+    not start there, page 1 is read first; if page 1 has no text, for example
+    because triage or the time budget skipped it, the first page with text is
+    used instead. A supplier detected from page 1 is kept in ``page_cache``,
+    so a preview and the full run of the same file agree on it.
+    
+    Args:
+        pdf_path (str): Path to the PDF file
+        page_cache (dict, optional): Page cache as accepted by extract_pages
+        log_callback (function, optional): Callback for logging
+        **extract_options: Page selection and OCR options accepted by extract_pages
+        
+    Yields:
+        tuple: (page number, number of pages being extracted, page text, vendor name)
+    """
+    vendor_key = (os.path.abspath(pdf_path), 'vendor')
+    vendor = page_cache.get(vendor_key) if page_cache is not None else None
+    first_page_read = vendor is not None
+    
+    def detect(page_num, page_text):
+        if not first_page_text(page_text):
+            return None
+        detected = detect_vendor(page_text)
+        if page_num == 1 and page_cache is not None:
+            page_cache[vendor_key] = detected
+        if log_callback:
+            log_callback(f"Detected vendor: {detected} (from page {page_num})")
+        return detected
+    
+    for page_num, total_pages, page_text in extract_pages(pdf_path, page_cache=page_cache,
+                                                         log_callback=log_callback, **extract_options):
+        if not first_page_read:
+            first_page_read = True
+            if page_num != 1:
+                # The selection starts after page 1, which identifies the supplier
+                first_options = dict(extract_options, pages=[1])
+                for _, _, first_text in extract_pages(pdf_path, page_cache=page_cache,
+                                                      log_callback=log_callback, **first_options):
+                    vendor = detect(1, first_text)
+        if vendor is None:
+            vendor = detect(page_num, page_text)
+        yield page_num, total_pages, page_text, vendor or GENERIC_VENDOR
+
+
+def preview_invoice(pdf_path, pages=None, first_n=None, page_callback=None, log_callback=None,
+                    page_cache=None, **extract_options):
+    """
+    Extract and parse a selection of pages without exporting anything
+    
+    Args:
+        pdf_path (str): Path to the PDF file
+        pages (list or str, optional): Page numbers or page range such as "1-3,5"
+        first_n (int, optional): Preview the first N pages instead of ``pages``
+        page_callback (function, optional): Called with (page number, number of
+            pages, items parsed from the page) as soon as each page is done
+        log_callback (function, optional): Callback for logging
+        page_cache (dict, optional): Cache filled with the extracted pages, which
+            can be passed to invoice_pdf_to_excel to avoid extracting them twice
+        **extract_options: Extra options passed to extract_pages
+        
+    Returns:
+        list: Items parsed from the previewed pages
+    """
+    if first_n:
+        pages = list(range(1, first_n + 1))
+    
+    items = []
+    for page_num, total_pages, page_text, vendor in extract_pages_with_vendor(
+            pdf_path, pages=pages, page_cache=page_cache, log_callback=log_callback, **extract_options):
+        page_items = parse_invoice_text(page_text, vendor=vendor)
+        items.extend(page_items)
+        if page_callback:
+            page_callback(page_num, total_pages, page_items)
+    
+    if log_callback:
+        log_callback(f"Preview found {len(items)} items")
+    return items
+
+
 def run_application():
     """
     Run the GUI application
+    
+    Set the INVOICE_PROFILE_DIR environment variable to profile every
+    conversion started from the GUI (batch queue workers then convert one
+    file at a time), and INVOICE_DB_PATH to store the
+    parsed items of every conversion in a SQLite database.
+    INVOICE_PAGE_TIMEOUT and INVOICE_DOCUMENT_TIMEOUT set the OCR time
+    budgets in seconds per page and per document, for previews as well as
+    conversions, INVOICE_OCR_PROFILE the OCR profile used for scanned
+    pages in both, and INVOICE_OCR_MODE the OCR mode ("standard" or
+    "adaptive"). Set INVOICE_FORCE_FULL_OCR=1 to tick the GUI
+    option that runs full OCR on every scanned page instead of triaging.
     """
-    root = create_gui(invoice_pdf_to_excel)
+    # OCR options shared by previews and full conversions, so a preview is
+    # bounded by the same time budgets and reads pages with the same profile
+    # as the conversion it stands in for, which can then reuse its pages
+    extract_options = {}
+    if os.environ.get("INVOICE_PAGE_TIMEOUT"):
+        extract_options['page_timeout'] = float(os.environ["INVOICE_PAGE_TIMEOUT"])
+    if os.environ.get("INVOICE_DOCUMENT_TIMEOUT"):
+        extract_options['document_timeout'] = float(os.environ["INVOICE_DOCUMENT_TIMEOUT"])
+    if os.environ.get("INVOICE_OCR_PROFILE"):
+        extract_options['ocr_profile'] = os.environ["INVOICE_OCR_PROFILE"]
+    if os.environ.get("INVOICE_OCR_MODE"):
+        ocr_mode = os.environ["INVOICE_OCR_MODE"].lower()
+        if ocr_mode not in OCR_MODES:
+            raise ValueError(f"INVOICE_OCR_MODE must be one of {', '.join(OCR_MODES)}, got {ocr_mode!r}")
+        extract_options['ocr_mode'] = ocr_mode
+    
+    options = dict(extract_options)
+    if os.environ.get("INVOICE_PROFILE_DIR"):
+        options['profile_dir'] = os.environ["INVOICE_PROFILE_DIR"]
+    if os.environ.get("INVOICE_DB_PATH"):
+        options['db_path'] = os.environ["INVOICE_DB_PATH"]
+    force_full_ocr = os.environ.get("INVOICE_FORCE_FULL_OCR", "").lower() in ("1", "true", "yes")
+    root = create_gui(partial(invoice_pdf_to_excel, **options),
+                      preview_callback=partial(preview_invoice, **extract_options),
+                      force_full_ocr=force_full_ocr)
     root.mainloop()
 
 
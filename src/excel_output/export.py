@@ -4,13 +4,15 @@ Excel output module for exporting data to Excel
 import pandas as pd
 
 
-def export_to_excel(data, output_excel_path):
+def export_to_excel(data, output_excel_path, skipped_pages=None):
     """
     Export data to Excel with formatting
     
     Args:
         data (list): List of dictionaries containing invoice data
         output_excel_path (str): Path to save Excel file
+        skipped_pages (list, optional): Dictionaries with the page number and
+            reason of pages that were not processed, listed on their own sheet
     
     Returns:
         bool: True if successful, False otherwise
@@ -31,7 +33,8 @@ def export_to_excel(data, output_excel_path):
     # Reorder columns to match the image format
     column_order = [
         'Purchased', 'Received', 'Code1', 'Code2', 'Brand', 'Description',
-        'Product', 'CostPerPacket', 'TotalCost', 'BarInParanthesis', 'UnitCost', 'Tentative'
+        'Product', 'CostPerPacket', 'TotalCost', 'BarInParanthesis', 'UnitCost', 'Tentative',
+        'OcrProfile'
     ]
     
     # Make sure all columns exist before reordering
@@ -67,5 +70,11 @@ def export_to_excel(data, output_excel_path):
                     pass
             adjusted_width = (max_length + 2)
             worksheet.column_dimensions[column[0].column_letter].width = adjusted_width
+        
+        # List pages that were not processed, so missing items can be checked by hand
+        if skipped_pages:
+            pd.DataFrame(skipped_pages, columns=['Page', 'Reason']).to_excel(
+                writer, index=False, sheet_name='Skipped Pages'
+            )
     
     return True 
\ No newline at end of file
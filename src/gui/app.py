@@ -2,22 +2,74 @@
 GUI module for the invoice conversion application
 """
 import os
+import queue
+import subprocess
+import sys
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox, ttk
 from datetime import datetime
 import pytesseract
 
 
-def create_gui(process_callback):
+# Item fields shown in the parsed items table
+ITEM_COLUMNS = [
+    'Page', 'Purchased', 'Received', 'Code1', 'Code2', 'Brand', 'Description',
+    'Product', 'CostPerPacket', 'TotalCost', 'OcrProfile'
+]
+
+# Columns of the batch queue table
+QUEUE_COLUMNS = ['File', 'Status', 'Progress', 'Items', 'Elapsed']
+
+# Milliseconds between checks for updates from background workers
+QUEUE_POLL_MS = 200
+
+# Allowed number of batch queue workers
+MIN_WORKERS = 1
+MAX_WORKERS = 16
+
+
+def open_file(path):
+    """
+    Open a file with the application associated with it
+    
+    Args:
+        path (str): Path of the file to open
+    """
+    if sys.platform == 'win32':
+        os.startfile(path)
+    elif sys.platform == 'darwin':
+        subprocess.Popen(['open', path])
+    else:
+        subprocess.Popen(['xdg-open', path])
+
+
+def create_gui(process_callback, preview_callback=None, force_full_ocr=False):
     """
     Create the main GUI window
     
     Args:
         process_callback (function): Callback function to process the PDF file
+        preview_callback (function, optional): Callback function to preview a
+            page range of the PDF file without exporting it
+        force_full_ocr (bool): Initial state of the checkbox that runs full OCR
+            on every scanned page instead of triaging pages first
         
     Returns:
         tk.Tk: The main window object
     """
+    # Pages extracted by a preview, reused by the full run of the same file
+    page_cache = {}
+    
+    # Batch queue state: jobs by tree item id, and updates posted by workers
+    jobs = {}
+    events = queue.Queue()
+    
+    # Worker pool shared by all batch runs, created when first needed
+    executor = None
+    executor_workers = None
+    
     def select_pdf():
         file_path = filedialog.askopenfilename(
             title="Select PDF Invoice",
@@ -26,6 +78,7 @@ def create_gui(process_callback):
         if file_path:
             input_entry.delete(0, tk.END)
             input_entry.insert(0, file_path)
+            page_cache.clear()
             
             # Auto-generate output path with timestamp
             directory = os.path.dirname(file_path)
@@ -51,6 +104,191 @@ def create_gui(process_callback):
         log_text.see(tk.END)  # Scroll to the end
         root.update_idletasks()  # Update the UI
     
+    def show_page_items(page_num, total_pages, items):
+        for item in items:
+            items_tree.insert("", tk.END, values=[
+                "" if item.get(col) is None else item.get(col) for col in ITEM_COLUMNS
+            ])
+        status_label.config(text=f"Processed page {page_num} ({total_pages} pages selected)...", foreground="blue")
+        root.update_idletasks()  # Show the new rows right away
+    
+    def preview_file():
+        input_path = input_entry.get()
+        
+        if not input_path:
+            messagebox.showerror("Error", "Please select an input PDF to preview.")
+            return
+        
+        try:
+            status_label.config(text="Previewing...", foreground="blue")
+            preview_button.config(state="disabled")
+            process_button.config(state="disabled")
+            log_text.delete(1.0, tk.END)
+            items_tree.delete(*items_tree.get_children())
+            log_message(f"Previewing pages {pages_entry.get() or 'all'}...")
+            
+            pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+            
+            items = preview_callback(input_path, pages=pages_entry.get() or None,
+                                     page_callback=show_page_items, log_callback=log_message,
+                                     page_cache=page_cache, force_full_ocr=force_full_ocr_var.get())
+            status_label.config(text=f"Preview done: {len(items)} items. Process PDF to run the full file.",
+                                foreground="green")
+        except Exception as e:
+            status_label.config(text="Error occurred!", foreground="red")
+            log_message(f"Error: {str(e)}")
+            messagebox.showerror("Error", f"An error occurred:\n{str(e)}")
+        finally:
+            preview_button.config(state="normal")
+            process_button.config(state="normal")
+    
+    def add_jobs(file_paths):
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        for file_path in file_paths:
+            stem = os.path.splitext(os.path.basename(file_path))[0]
+            output_path = os.path.join(os.path.dirname(file_path), f"{stem}_invoice_data_{timestamp}.xlsx")
+            job_id = queue_tree.insert("", tk.END, values=[os.path.basename(file_path), "Queued", "", "", ""])
+            jobs[job_id] = {'input': file_path, 'output': output_path, 'status': "Queued", 'started': None}
+        notebook.select(queue_tab)
+    
+    def add_files():
+        file_paths = filedialog.askopenfilenames(
+            title="Select PDF Invoices",
+            filetypes=[("PDF files", "*.pdf"), ("All files", "*.*")]
+        )
+        add_jobs(file_paths)
+    
+    def add_folder():
+        directory = filedialog.askdirectory(title="Select Folder of PDF Invoices")
+        if directory:
+            add_jobs(sorted(
+                os.path.join(directory, name) for name in os.listdir(directory)
+                if name.lower().endswith(".pdf")
+            ))
+    
+    def set_job(job_id, **values):
+        jobs[job_id].update(values)
+        for col, value in values.items():
+            column = col.capitalize()
+            if column in QUEUE_COLUMNS:
+                queue_tree.set(job_id, column, value)
+    
+    def run_job(job_id, input_path, output_path, full_ocr):
+        # Runs on a worker thread: only post events, never touch widgets here
+        name = os.path.basename(input_path)
+        item_count = 0
+        pages_done = 0
+        
+        def on_page(page_num, total_pages, items):
+            nonlocal item_count, pages_done
+            item_count += len(items)
+            pages_done += 1
+            events.put(('progress', job_id, f"{pages_done}/{total_pages} pages", item_count))
+        
+        events.put(('started', job_id))
+        try:
+            success = process_callback(input_path, output_path,
+                                       log_callback=lambda message: events.put(('log', f"[{name}] {message}")),
+                                       page_callback=on_page, force_full_ocr=full_ocr)
+            events.put(('finished', job_id, "Done" if success else "Failed: no items found", item_count))
+        except Exception as e:
+            events.put(('log', f"[{name}] Error: {str(e)}"))
+            events.put(('finished', job_id, f"Failed: {str(e)}", item_count))
+    
+    def read_workers():
+        try:
+            workers = int(workers_spinbox.get())
+        except ValueError:
+            workers = None
+        if workers is None or not MIN_WORKERS <= workers <= MAX_WORKERS:
+            clamped = MIN_WORKERS if workers is None else min(max(workers, MIN_WORKERS), MAX_WORKERS)
+            workers_spinbox.set(clamped)
+            messagebox.showerror("Error", f"Workers must be a whole number from {MIN_WORKERS} to {MAX_WORKERS}. "
+                                          f"It has been set to {clamped}.")
+            return None
+        return workers
+    
+    def get_executor(workers):
+        nonlocal executor, executor_workers
+        if executor is not None and workers != executor_workers:
+            if any(job['status'] in ("Waiting", "Running") for job in jobs.values()):
+                # Replacing the pool now would run more jobs at once than either setting allows
+                log_message(f"Workers stay at {executor_workers} until the running batch finishes")
+                return executor
+            # Idle workers exit once the old pool is shut down
+            executor.shutdown(wait=False)
+            executor = None
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=workers)
+            executor_workers = workers
+        return executor
+    
+    def start_jobs(job_ids):
+        if not job_ids:
+            return
+        workers = read_workers()
+        if workers is None:
+            return
+        # Make sure you have Tesseract OCR installed and in your PATH
+        pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
+        
+        pool = get_executor(workers)
+        # Read on the main thread; workers must not touch Tk variables
+        full_ocr = force_full_ocr_var.get()
+        for job_id in job_ids:
+            set_job(job_id, status="Waiting", progress="", items="", elapsed="")
+            pool.submit(run_job, job_id, jobs[job_id]['input'], jobs[job_id]['output'], full_ocr)
+    
+    def start_queue():
+        start_jobs([job_id for job_id, job in jobs.items() if job['status'] == "Queued"])
+    
+    def retry_failed():
+        selected = [job_id for job_id in queue_tree.selection() if jobs[job_id]['status'].startswith("Failed")]
+        start_jobs(selected or [job_id for job_id, job in jobs.items() if job['status'].startswith("Failed")])
+    
+    def open_results(event=None):
+        for job_id in queue_tree.selection():
+            if jobs[job_id]['status'] == "Done":
+                open_file(jobs[job_id]['output'])
+    
+    def clear_finished():
+        for job_id, job in list(jobs.items()):
+            if job['status'] == "Done":
+                queue_tree.delete(job_id)
+                del jobs[job_id]
+    
+    def poll_events():
+        while True:
+            try:
+                event = events.get_nowait()
+            except queue.Empty:
+                break
+            kind, payload = event[0], event[1:]
+            if kind == 'log':
+                log_message(payload[0])
+            elif kind == 'started':
+                set_job(payload[0], status="Running", started=time.monotonic())
+            elif kind == 'progress':
+                job_id, progress, item_count = payload
+                set_job(job_id, progress=progress, items=item_count)
+            elif kind == 'finished':
+                job_id, status, item_count = payload
+                set_job(job_id, status=status, items=item_count,
+                        elapsed=f"{time.monotonic() - jobs[job_id]['started']:.1f}s")
+        
+        # Keep the elapsed time of running jobs ticking
+        for job_id, job in jobs.items():
+            if job['status'] == "Running":
+                queue_tree.set(job_id, 'Elapsed', f"{time.monotonic() - job['started']:.1f}s")
+        root.after(QUEUE_POLL_MS, poll_events)
+    
+    def on_close():
+        # Drop queued jobs so closing the window does not wait for the whole batch;
+        # jobs already running finish before the process exits
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        root.destroy()
+    
     def process_file():
         input_path = input_entry.get()
         output_path = output_entry.get()
@@ -64,13 +302,16 @@ def create_gui(process_callback):
             status_label.config(text="Processing...", foreground="blue")
             process_button.config(state="disabled")
             log_text.delete(1.0, tk.END)  # Clear previous logs
+            items_tree.delete(*items_tree.get_children())
             log_message("Starting PDF processing...")
             
             # Make sure you have Tesseract OCR installed and in your PATH
             pytesseract.pytesseract.tesseract_cmd = r'C:\Program Files\Tesseract-OCR\tesseract.exe'
             
             # Process the file with logging callback
-            process_callback(input_path, output_path, log_callback=log_message)
+            process_callback(input_path, output_path, log_callback=log_message,
+                             page_callback=show_page_items, page_cache=page_cache,
+                             force_full_ocr=force_full_ocr_var.get())
             
             # Update status and re-enable process button
             status_label.config(text="File processed successfully!", foreground="green")
@@ -88,8 +329,8 @@ def create_gui(process_callback):
     # Create main window
     root = tk.Tk()
     root.title("Invoice PDF to Excel Converter")
-    root.geometry("800x600")  # Increased height for log section
-    root.minsize(800, 600)  # Set minimum window size
+    root.geometry("900x800")  # Increased height for items and log sections
+    root.minsize(900, 800)  # Set minimum window size
     
     # Configure style
     style = ttk.Style()
@@ -124,17 +365,84 @@ def create_gui(process_callback):
     output_button = ttk.Button(main_frame, text="Browse...", command=select_save_location)
     output_button.grid(row=2, column=2, padx=5)
     
+    # Preview page range
+    ttk.Label(main_frame, text="Preview Pages:").grid(row=3, column=0, padx=5, sticky="e")
+    pages_entry = ttk.Entry(main_frame, width=50)
+    pages_entry.insert(0, "1-2")
+    pages_entry.grid(row=3, column=1, padx=5, sticky="ew")
+    preview_button = ttk.Button(main_frame, text="Preview", command=preview_file)
+    preview_button.grid(row=3, column=2, padx=5)
+    if preview_callback is None:
+        preview_button.config(state="disabled")
+    
+    # Override for scanned pages wrongly skipped by triage
+    force_full_ocr_var = tk.BooleanVar(value=force_full_ocr)
+    force_full_ocr_check = ttk.Checkbutton(main_frame, text="OCR every scanned page (skip triage)",
+                                           variable=force_full_ocr_var)
+    force_full_ocr_check.grid(row=4, column=1, padx=5, sticky="w")
+    
     # Process button
     process_button = ttk.Button(main_frame, text="Process PDF", command=process_file, width=20)
-    process_button.grid(row=3, column=1, pady=20)
+    process_button.grid(row=5, column=1, pady=20)
     
     # Status label
     status_label = ttk.Label(main_frame, text="Ready to process files...", foreground="gray")
-    status_label.grid(row=4, column=0, columnspan=3)
+    status_label.grid(row=6, column=0, columnspan=3)
+    
+    # Parsed items and batch queue tabs
+    notebook = ttk.Notebook(main_frame)
+    notebook.grid(row=7, column=0, columnspan=3, sticky="nsew", pady=10)
+    items_frame = ttk.Frame(notebook, padding="10")
+    notebook.add(items_frame, text="Parsed Items")
+    queue_tab = ttk.Frame(notebook, padding="10")
+    notebook.add(queue_tab, text="Batch Queue")
+    
+    items_tree = ttk.Treeview(items_frame, columns=ITEM_COLUMNS, show="headings", height=8)
+    for col in ITEM_COLUMNS:
+        items_tree.heading(col, text=col)
+        items_tree.column(col, width=200 if col == 'Product' else 70, stretch=(col == 'Product'))
+    items_scrollbar = ttk.Scrollbar(items_frame, orient="vertical", command=items_tree.yview)
+    items_tree.configure(yscrollcommand=items_scrollbar.set)
+    items_tree.grid(row=0, column=0, sticky="nsew")
+    items_scrollbar.grid(row=0, column=1, sticky="ns")
+    items_frame.grid_columnconfigure(0, weight=1)
+    items_frame.grid_rowconfigure(0, weight=1)
+    
+    # Batch queue toolbar
+    queue_toolbar = ttk.Frame(queue_tab)
+    queue_toolbar.grid(row=0, column=0, columnspan=2, sticky="ew")
+    add_files_button = ttk.Button(queue_toolbar, text="Add Files...", command=add_files)
+    add_files_button.pack(side=tk.LEFT, padx=2)
+    add_folder_button = ttk.Button(queue_toolbar, text="Add Folder...", command=add_folder)
+    add_folder_button.pack(side=tk.LEFT, padx=2)
+    ttk.Label(queue_toolbar, text="Workers:").pack(side=tk.LEFT, padx=(10, 0))
+    workers_spinbox = ttk.Spinbox(queue_toolbar, from_=MIN_WORKERS, to=MAX_WORKERS, width=4)
+    workers_spinbox.set(min(4, os.cpu_count() or 1))
+    workers_spinbox.pack(side=tk.LEFT, padx=2)
+    start_queue_button = ttk.Button(queue_toolbar, text="Start", command=start_queue)
+    start_queue_button.pack(side=tk.LEFT, padx=2)
+    retry_button = ttk.Button(queue_toolbar, text="Retry Failed", command=retry_failed)
+    retry_button.pack(side=tk.LEFT, padx=2)
+    open_result_button = ttk.Button(queue_toolbar, text="Open Result", command=open_results)
+    open_result_button.pack(side=tk.LEFT, padx=2)
+    ttk.Button(queue_toolbar, text="Clear Finished", command=clear_finished).pack(side=tk.LEFT, padx=2)
+    
+    # Batch queue table
+    queue_tree = ttk.Treeview(queue_tab, columns=QUEUE_COLUMNS, show="headings", height=8)
+    for col in QUEUE_COLUMNS:
+        queue_tree.heading(col, text=col)
+        queue_tree.column(col, width=250 if col == 'File' else 90, stretch=(col == 'File'))
+    queue_scrollbar = ttk.Scrollbar(queue_tab, orient="vertical", command=queue_tree.yview)
+    queue_tree.configure(yscrollcommand=queue_scrollbar.set)
+    queue_tree.grid(row=1, column=0, sticky="nsew", pady=(5, 0))
+    queue_scrollbar.grid(row=1, column=1, sticky="ns", pady=(5, 0))
+    queue_tree.bind('<Double-1>', open_results)
+    queue_tab.grid_columnconfigure(0, weight=1)
+    queue_tab.grid_rowconfigure(1, weight=1)
     
     # Log section
     log_frame = ttk.LabelFrame(main_frame, text="Processing Log", padding="10")
-    log_frame.grid(row=5, column=0, columnspan=3, sticky="nsew", pady=10)
+    log_frame.grid(row=8, column=0, columnspan=3, sticky="nsew", pady=10)
     
     # Create text widget for logs with scrollbar
     log_text = tk.Text(log_frame, height=10, width=80, wrap=tk.WORD)
@@ -171,6 +479,17 @@ def create_gui(process_callback):
     # Add tooltips to buttons
     create_tooltip(input_button, "Select the PDF invoice file to process")
     create_tooltip(output_button, "Choose where to save the Excel file")
+    create_tooltip(preview_button, "Parse only the selected pages, e.g. 1-3,5")
+    create_tooltip(force_full_ocr_check, "Use when a page with items was skipped as blank or without items")
     create_tooltip(process_button, "Start processing the PDF file")
+    create_tooltip(add_files_button, "Add one or more PDF invoices to the batch queue")
+    create_tooltip(add_folder_button, "Add every PDF in a folder to the batch queue")
+    create_tooltip(start_queue_button, "Process all queued files on background workers")
+    create_tooltip(retry_button, "Process the selected failed files again, or all failed files")
+    create_tooltip(open_result_button, "Open the Excel file of the selected finished jobs")
+    
+    # Pick up updates from background workers
+    root.after(QUEUE_POLL_MS, poll_events)
+    root.protocol("WM_DELETE_WINDOW", on_close)
     
     return root 
\ No newline at end of file
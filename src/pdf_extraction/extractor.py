@@ -1,39 +1,506 @@
 """
 PDF extraction module for extracting text from PDF files
 """
+import os
+import re
+import time
 import pdfplumber  # For text extraction from PDF
 import pytesseract  # For OCR if PDF is scanned
 from PIL import Image  # For handling image data
 import io
+from src.pdf_extraction.ocr_profiles import DEFAULT_PROFILE, ocr_config
+from src.text_processing.processor import parse_generic_line
 
+# Resolution used for the full OCR pass
+OCR_RESOLUTION = 300
 
-def extract_text_from_pdf(pdf_path):
+# Resolution used to retry a page whose OCR ran out of time
+FALLBACK_OCR_RESOLUTION = 150
+
+# Retry resolution in adaptive mode, whose fast pass already reads pages at 150 DPI
+ADAPTIVE_FALLBACK_OCR_RESOLUTION = 100
+
+# Share of a page's time budget given to the first OCR attempt; the rest is
+# left for the reduced resolution retry
+FIRST_ATTEMPT_BUDGET_SHARE = 0.7
+
+# Resolution and word confidence used by the fast pass of adaptive OCR
+FAST_OCR_RESOLUTION = 150
+MIN_WORD_CONFIDENCE = 70
+
+# Fraction of re-OCR lines above which the whole page is re-OCR'd at once
+FULL_REOCR_FRACTION = 0.5
+
+# White space in pixels around each weak line when they are stacked for re-OCR
+REOCR_LINE_GAP = 20
+
+# Supported values of the ocr_mode option
+OCR_MODES = ('standard', 'adaptive')
+
+# Low resolution used to cheaply probe whether a page can contain line items
+TRIAGE_RESOLUTION = 100
+
+# Fraction of dark pixels below which a page is considered blank
+TRIAGE_MIN_INK = 0.005
+
+# Markers of invoice line items that survive low-resolution OCR reasonably well
+ITEM_MARKER_PATTERN = re.compile(r'\b(CAS|C4S|CA5|PK|BAG|8AG)\b')
+PRICE_PATTERN = re.compile(r'\b\d+[.,]\d{2}\b')
+
+
+def _check_deadline(deadline):
     """
-    Extract text from PDF (works for both text-based and scanned PDFs)
+    Return the seconds left before the deadline, or 0 if there is none
+
+    Raises:
+        TimeoutError: If the deadline has passed
+    """
+    if deadline is None:
+        return 0
+    timeout = deadline - time.monotonic()
+    if timeout <= 0:
+        raise TimeoutError("OCR time budget exhausted")
+    return timeout
+
+
+def _run_tesseract(ocr_function, img, deadline=None, **kwargs):
+    """
+    Call a pytesseract function, killing Tesseract if it runs past the deadline
+
+    Raises:
+        TimeoutError: If the deadline has passed or Tesseract was killed
+    """
+    timeout = _check_deadline(deadline)  # pytesseract treats 0 as no timeout
+    try:
+        return ocr_function(img, timeout=timeout, **kwargs)
+    except RuntimeError as e:
+        # pytesseract kills the Tesseract process and raises RuntimeError on timeout
+        if 'timeout' in str(e).lower():
+            raise TimeoutError(f"OCR did not finish within {timeout:.1f}s") from e
+        raise
+
+
+def ocr_image(img, config='--oem 3 --psm 6', deadline=None):
+    """
+    Run Tesseract OCR on a page image
+
+    Args:
+        img (PIL.Image.Image): Page image
+        config (str): Tesseract configuration flags
+        deadline (float, optional): time.monotonic() value by which OCR must finish
+
+    Returns:
+        str: Recognized text
+
+    Raises:
+        TimeoutError: If OCR did not finish before the deadline
+    """
+    # Convert to grayscale and enhance contrast
+    img = img.convert('L')
+    img_byte_arr = io.BytesIO()
+    img.save(img_byte_arr, format='PNG')
+    img_byte_arr = img_byte_arr.getvalue()
+    return _run_tesseract(pytesseract.image_to_string, Image.open(io.BytesIO(img_byte_arr)),
+                          deadline=deadline, config=config)
+
+
+def _ocr_lines(img, config='--oem 3 --psm 6', deadline=None):
+    """
+    Run Tesseract and group the recognized words into lines
+
+    Returns:
+        list: Dictionaries with the line text, bounding box and lowest word confidence
+    """
+    data = _run_tesseract(pytesseract.image_to_data, img, deadline=deadline, config=config,
+                          output_type=pytesseract.Output.DICT)
+    lines = {}
+    for i, word in enumerate(data['text']):
+        conf = float(data['conf'][i])
+        if conf < 0 or not word.strip():
+            continue
+        key = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+        left, top = data['left'][i], data['top'][i]
+        right, bottom = left + data['width'][i], top + data['height'][i]
+        line = lines.setdefault(key, {'words': [], 'box': [left, top, right, bottom], 'conf': conf})
+        line['words'].append(word)
+        box = line['box']
+        line['box'] = [min(box[0], left), min(box[1], top), max(box[2], right), max(box[3], bottom)]
+        line['conf'] = min(line['conf'], conf)
+
+    return [
+        {'text': ' '.join(line['words']), 'box': line['box'], 'conf': line['conf']}
+        for line in lines.values()
+    ]
+
+
+def _needs_reocr(line, min_confidence):
+    if line['conf'] < min_confidence:
+        return True
+    # Lines that look like items but do not parse are worth a second look
+    text = line['text']
+    looks_like_item = ITEM_MARKER_PATTERN.search(text) or len(PRICE_PATTERN.findall(text)) >= 2
+    return bool(looks_like_item) and not parse_generic_line(text)
+
+
+def _item_evidence(text):
+    # Reason to expect line items in low-resolution OCR text, or None
+    if ITEM_MARKER_PATTERN.search(text):
+        return "item codes found"
+    prices = PRICE_PATTERN.findall(text)
+    if len(prices) >= 3:
+        return f"{len(prices)} prices found"
+    return None
+
+
+def ocr_page_adaptive(page, min_confidence=MIN_WORD_CONFIDENCE, log_callback=None, page_num=None,
+                      deadline=None, profile=DEFAULT_PROFILE, triage=False):
+    """
+    OCR a scanned page with a fast low-resolution pass, re-OCR'ing only weak lines
+
+    Lines whose lowest word confidence is below ``min_confidence``, or that
+    look like line items but are rejected by the generic line parser, are
+    cropped from a 300 DPI render, stacked into one image and recognized
+    again in a single Tesseract run. When most of the page is weak, the
+    whole page is re-OCR'd instead.
+
+    With ``triage`` the fast pass doubles as the triage probe: a page on
+    which it finds no item codes or prices is returned without re-OCR.
+
+    Args:
+        page (pdfplumber.page.Page): Page without a text layer
+        min_confidence (float): Word confidence (0-100) below which a line is re-OCR'd
+        log_callback (function, optional): Callback for logging
+        page_num (int, optional): Page number used in log messages
+        deadline (float, optional): time.monotonic() value by which OCR must finish
+        profile (str): Name of the OCR profile to use
+        triage (bool): Skip re-OCR of pages without line items
+
+    Returns:
+        str: Recognized text
+
+    Raises:
+        TimeoutError: If OCR did not finish before the deadline
+    """
+    _check_deadline(deadline)
+    fast_img = page.to_image(resolution=FAST_OCR_RESOLUTION).original.convert('L')
+    lines = _ocr_lines(fast_img, config=ocr_config(profile), deadline=deadline)
+    fast_text = '\n'.join(line['text'] for line in lines)
+    if triage and not _item_evidence(fast_text):
+        if log_callback:
+            log_callback(f"Page {page_num}: no item codes or prices found in fast OCR pass, not re-OCR'ing")
+        return fast_text
+    weak = [i for i, line in enumerate(lines) if _needs_reocr(line, min_confidence)]
+
+    if not weak:
+        if log_callback:
+            log_callback(f"Page {page_num}: fast OCR pass accepted ({len(lines)} lines)")
+        return fast_text
+
+    _check_deadline(deadline)
+    full_img = page.to_image(resolution=OCR_RESOLUTION).original
+    if not lines or len(weak) / len(lines) > FULL_REOCR_FRACTION:
+        if log_callback:
+            log_callback(f"Page {page_num}: {len(weak)}/{len(lines)} weak lines, re-OCR'ing full page")
+        return ocr_image(full_img, config=ocr_config(profile), deadline=deadline)
+
+    scale = OCR_RESOLUTION / FAST_OCR_RESOLUTION
+    padding = 4
+    full_img = full_img.convert('L')
+    crops = []
+    for i in weak:
+        left, top, right, bottom = lines[i]['box']
+        crop_box = (
+            max(0, int((left - padding) * scale)),
+            max(0, int((top - padding) * scale)),
+            min(full_img.width, int((right + padding) * scale)),
+            min(full_img.height, int((bottom + padding) * scale)),
+        )
+        crops.append(full_img.crop(crop_box))
+
+    # One Tesseract run over all weak lines instead of one process per line
+    stacked, slots = _stack_lines(crops, REOCR_LINE_GAP)
+    slot_texts = [[] for _ in slots]
+    for found in sorted(_ocr_lines(stacked, config=ocr_config(profile), deadline=deadline),
+                        key=lambda found: (found['box'][1], found['box'][0])):
+        center = (found['box'][1] + found['box'][3]) / 2
+        for slot, (slot_top, slot_bottom) in enumerate(slots):
+            if slot_top - REOCR_LINE_GAP / 2 <= center <= slot_bottom + REOCR_LINE_GAP / 2:
+                slot_texts[slot].append(found['text'])
+                break
+    for i, texts in zip(weak, slot_texts):
+        if texts:
+            lines[i]['text'] = ' '.join(texts)
+
+    if log_callback:
+        log_callback(f"Page {page_num}: re-OCR'd {len(weak)}/{len(lines)} lines at {OCR_RESOLUTION} DPI "
+                     f"in one pass")
+    return '\n'.join(line['text'] for line in lines)
+
+
+def _stack_lines(crops, gap):
+    """
+    Paste line images below each other on a white background
+
+    Returns:
+        tuple: (stacked image, list of (top, bottom) pixel rows of each line)
+    """
+    width = max(crop.width for crop in crops) + 2 * gap
+    height = sum(crop.height for crop in crops) + gap * (len(crops) + 1)
+    stacked = Image.new('L', (width, height), 255)
+    slots = []
+    y = gap
+    for crop in crops:
+        stacked.paste(crop, (gap, y))
+        slots.append((y, y + crop.height))
+        y += crop.height + gap
+    return stacked, slots
+
+
+def triage_page(page, deadline=None, probe=True):
+    """
+    Cheaply decide whether a scanned page can contain invoice line items
+
+    The page is rendered as a low-resolution thumbnail. Blank pages are
+    rejected from the ink density alone; otherwise a fast OCR probe looks
+    for CAS/PK/BAG codes or price columns.
+
+    Args:
+        page (pdfplumber.page.Page): Page without a text layer
+        deadline (float, optional): time.monotonic() value by which the probe must finish
+        probe (bool): Run the OCR probe; when False only blank pages are rejected
+
+    Returns:
+        tuple: (bool, str) whether the page needs full OCR and the reason
+    """
+    thumbnail = page.to_image(resolution=TRIAGE_RESOLUTION).original.convert('L')
+    histogram = thumbnail.histogram()
+    dark_pixels = sum(histogram[:128])
+    ink = dark_pixels / max(1, thumbnail.width * thumbnail.height)
+    if ink < TRIAGE_MIN_INK:
+        return False, f"blank page ({ink:.2%} ink)"
+    if not probe:
+        return True, "page has ink"
+
+    try:
+        probe_text = _run_tesseract(pytesseract.image_to_string, thumbnail, deadline=deadline,
+                                    config='--oem 3 --psm 6')
+    except TimeoutError:
+        # Leave the decision to the full OCR pass and its fallbacks
+        return True, "probe timed out"
+    evidence = _item_evidence(probe_text)
+    if evidence:
+        return True, f"{evidence} in probe"
+    return False, "no item codes or prices found in probe"
+
+
+def parse_page_range(spec, total_pages=None):
+    """
+    Parse a page range such as "1-3,5" into a sorted list of page numbers
+
+    Args:
+        spec (str): Comma separated page numbers and ranges; an open range
+            like "4-" runs to the last page
+        total_pages (int, optional): Number of pages in the document
+
+    Returns:
+        list: Sorted 1-based page numbers
+
+    Raises:
+        ValueError: If a range is reversed, a page number is below 1, or no
+            page of the document is left
+    """
+    pages = set()
+    for part in spec.replace(' ', '').split(','):
+        if not part:
+            continue
+        if '-' in part:
+            start, end = part.split('-', 1)
+            start = int(start) if start else 1
+            if end:
+                end = int(end)
+            elif total_pages:
+                end = total_pages
+            else:
+                raise ValueError(f"Open page range {part!r} needs the page count")
+            if start > end:
+                raise ValueError(f"Page range {part!r} is reversed")
+            pages.update(range(start, end + 1))
+        else:
+            pages.add(int(part))
+
+    if any(page < 1 for page in pages):
+        raise ValueError(f"Page numbers start at 1: {spec!r}")
+    if total_pages:
+        pages = {page for page in pages if page <= total_pages}
+        if not pages:
+            raise ValueError(f"No pages of {spec!r} exist in a document of {total_pages} pages")
+    return sorted(pages)
+
+
+def _page_deadline(page_timeout, document_deadline):
+    deadline = time.monotonic() + page_timeout if page_timeout else None
+    if document_deadline is not None:
+        deadline = document_deadline if deadline is None else min(deadline, document_deadline)
+    return deadline
+
+
+def _ocr_page(page, page_num, log_callback, ocr_mode, profile, page_deadline, triage=False):
+    """
+    OCR a scanned page within its time budget, retrying once at reduced resolution
+
+    The first attempt gets FIRST_ATTEMPT_BUDGET_SHARE of the time left before
+    ``page_deadline``; the retry gets the rest, so both together stay within it.
+
+    Returns:
+        str: Recognized text, or None if the page ran out of time
+    """
+    fallback_resolution = ADAPTIVE_FALLBACK_OCR_RESOLUTION if ocr_mode == 'adaptive' else FALLBACK_OCR_RESOLUTION
+    deadline = page_deadline
+    if page_deadline is not None:
+        deadline = time.monotonic() + (page_deadline - time.monotonic()) * FIRST_ATTEMPT_BUDGET_SHARE
+    try:
+        if ocr_mode == 'adaptive':
+            return ocr_page_adaptive(page, log_callback=log_callback, page_num=page_num, deadline=deadline,
+                                     profile=profile, triage=triage)
+        _check_deadline(deadline)
+        img = page.to_image(resolution=OCR_RESOLUTION).original
+        return ocr_image(img, config=ocr_config(profile), deadline=deadline)
+    except TimeoutError as e:
+        if log_callback:
+            log_callback(f"Page {page_num}: {e}, retrying at {fallback_resolution} DPI")
+
+    try:
+        _check_deadline(page_deadline)
+        img = page.to_image(resolution=fallback_resolution).original
+        return ocr_image(img, config=ocr_config(profile), deadline=page_deadline)
+    except TimeoutError as e:
+        if log_callback:
+            log_callback(f"Page {page_num}: {e}, skipping page")
+        return None
+
+
+def _extract_page(page, page_num, log_callback, triage, force_full_ocr, ocr_mode,
+                  profile=DEFAULT_PROFILE, page_timeout=None, document_deadline=None):
+    """
+    Extract the text of one page
+
+    Returns:
+        tuple: (page text, whether the text may be cached)
+    """
+    # Try to extract text directly (works for text-based PDFs)
+    page_text = page.extract_text()
+    if page_text:
+        return f"\n=== Page {page_num} ===\n" + page_text + "\n", True
+
+    # Once the document budget is spent, remaining scanned pages are skipped
+    if document_deadline is not None and time.monotonic() >= document_deadline:
+        if log_callback:
+            log_callback(f"Page {page_num}: skipped (document time budget exhausted)")
+        return f"\n=== Page {page_num} (SKIPPED: document time budget exhausted) ===\n", False
+
+    # The page budget covers triage, OCR and the reduced resolution retry
+    page_deadline = _page_deadline(page_timeout, document_deadline)
     
+    # If no text found, it's likely a scanned PDF - decide whether OCR is worth it.
+    # The fast pass of adaptive OCR takes the place of the OCR probe.
+    triage = triage and not force_full_ocr
+    if triage:
+        needs_ocr, reason = triage_page(page, deadline=page_deadline, probe=ocr_mode != 'adaptive')
+        if log_callback:
+            action = "OCR" if needs_ocr else "skipped"
+            log_callback(f"Page {page_num}: {action} ({reason})")
+        if not needs_ocr:
+            return f"\n=== Page {page_num} (SKIPPED: {reason}) ===\n", True
+
+    page_text = _ocr_page(page, page_num, log_callback, ocr_mode, profile, page_deadline, triage)
+    if page_text is None:
+        return f"\n=== Page {page_num} (SKIPPED: OCR timeout) ===\n", False
+    label = "OCR adaptive" if ocr_mode == 'adaptive' else "OCR"
+    return f"\n=== Page {page_num} ({label}, profile={profile}) ===\n" + page_text + "\n", True
+
+
+def extract_pages(pdf_path, pages=None, page_cache=None, log_callback=None, triage=True,
+                  force_full_ocr=False, ocr_mode='standard', page_timeout=None, document_timeout=None,
+                  ocr_profile=DEFAULT_PROFILE, page_profiles=None):
+    """
+    Extract text page by page, yielding each page as soon as it is done
+
     Args:
         pdf_path (str): Path to the PDF file
-        
+        pages (list or str, optional): 1-based page numbers, or a page range such
+            as "1-3,5", to extract; all pages if not set
+        page_cache (dict, optional): Cache of already extracted pages. Pages found
+            in it are not extracted again, and newly extracted pages are added.
+        log_callback (function, optional): Callback for logging
+        triage (bool): Skip full OCR of scanned pages that cannot contain line items.
+            In adaptive mode, blank pages are skipped and pages whose fast
+            pass finds no line items are not re-OCR'd.
+        force_full_ocr (bool): Run full OCR on every scanned page, overriding triage
+        ocr_mode (str): 'standard' for a single 300 DPI pass per scanned page, or
+            'adaptive' for a fast pass with high-resolution re-OCR of weak lines
+        page_timeout (float, optional): Seconds allowed per scanned page,
+            covering triage, OCR and its retry. A page whose first OCR attempt
+            runs over its share of the budget is retried once at reduced
+            resolution within the rest, and marked as skipped if that runs
+            over too.
+        document_timeout (float, optional): Seconds allowed for the whole
+            document; scanned pages left when it runs out are marked as skipped
+        ocr_profile (str): Name of the OCR profile used for scanned pages, see
+            ocr_profiles.OCR_PROFILES
+        page_profiles (dict, optional): OCR profile names by page number,
+            overriding ``ocr_profile`` for those pages
+
+    Yields:
+        tuple: (page number, number of pages being extracted, page text)
+
+    Raises:
+        ValueError: If ``ocr_mode`` is not one of OCR_MODES, or none of the
+            selected pages exist in the document
+    """
+    if ocr_mode not in OCR_MODES:
+        raise ValueError(f"Unknown OCR mode {ocr_mode!r}, expected one of {', '.join(OCR_MODES)}")
+    document_deadline = time.monotonic() + document_timeout if document_timeout else None
+    with pdfplumber.open(pdf_path) as pdf:
+        if isinstance(pages, str):
+            pages = parse_page_range(pages, len(pdf.pages))
+        page_numbers = pages if pages is not None else range(1, len(pdf.pages) + 1)
+        page_numbers = [num for num in page_numbers if 1 <= num <= len(pdf.pages)]
+        if pages is not None and not page_numbers:
+            raise ValueError(f"None of pages {pages} exist in a document of {len(pdf.pages)} pages")
+        for page_num in page_numbers:
+            profile = (page_profiles or {}).get(page_num, ocr_profile)
+            # The cached text is only valid if it was extracted with the same options
+            key = (os.path.abspath(pdf_path), page_num, triage and not force_full_ocr, ocr_mode, profile)
+            if page_cache is not None and key in page_cache:
+                yield page_num, len(page_numbers), page_cache[key]
+                continue
+
+            page_text, cacheable = _extract_page(pdf.pages[page_num - 1], page_num, log_callback,
+                                                 triage, force_full_ocr, ocr_mode, profile,
+                                                 page_timeout, document_deadline)
+            # Pages skipped for lack of time may succeed on a later run
+            if page_cache is not None and cacheable:
+                page_cache[key] = page_text
+            yield page_num, len(page_numbers), page_text
+
+
+def extract_text_from_pdf(pdf_path, log_callback=None, page_callback=None, **options):
+    """
+    Extract text from PDF (works for both text-based and scanned PDFs)
+
+    Args:
+        pdf_path (str): Path to the PDF file
+        log_callback (function, optional): Callback for logging
+        page_callback (function, optional): Called with (page number, number of
+            pages, page text) after each page is extracted
+        **options: Page selection, caching and OCR options accepted by extract_pages
+
     Returns:
         str: Extracted text from PDF
     """
     text = ""
-    with pdfplumber.open(pdf_path) as pdf:
-        for page_num, page in enumerate(pdf.pages, 1):
-            # Try to extract text directly (works for text-based PDFs)
-            page_text = page.extract_text()
-            if page_text:
-                text += f"\n=== Page {page_num} ===\n" + page_text + "\n"
-            else:
-                # If no text found, it's likely a scanned PDF - use OCR
-                img = page.to_image(resolution=300).original
-                # Convert to grayscale and enhance contrast
-                img = img.convert('L')
-                img_byte_arr = io.BytesIO()
-                img.save(img_byte_arr, format='PNG')
-                img_byte_arr = img_byte_arr.getvalue()
-                # Configure OCR for better recognition
-                custom_config = '--oem 3 --psm 6'
-                page_text = pytesseract.image_to_string(Image.open(io.BytesIO(img_byte_arr)), config=custom_config)
-                text += f"\n=== Page {page_num} (OCR) ===\n" + page_text + "\n"
-    return text 
\ No newline at end of file
+    for page_num, total_pages, page_text in extract_pages(pdf_path, log_callback=log_callback, **options):
+        text += page_text
+        if page_callback:
+            page_callback(page_num, total_pages, page_text)
+    return text
\ No newline at end of file
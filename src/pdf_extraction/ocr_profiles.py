@@ -0,0 +1,48 @@
+"""
+Named Tesseract configurations for OCR of invoice pages
+"""
+import string
+
+# Characters that appear in invoice item rows: codes, product names, units,
+# quantities and prices. Leaves out symbols like * = < > % that clean_line
+# otherwise has to strip again.
+ITEM_ROW_CHARACTERS = string.ascii_letters + string.digits + ".$()/&,"
+
+# Each profile sets the page segmentation mode, an optional character
+# whitelist and whether Tesseract's word dictionaries are loaded.
+OCR_PROFILES = {
+    # Tesseract defaults: one uniform block of text, full dictionaries
+    'default': {'psm': 6, 'whitelist': None, 'dictionary': True},
+    # Invoice tables: no dictionary corrections that turn 0z into Oz or 12 into l2
+    'table': {'psm': 6, 'whitelist': None, 'dictionary': False},
+    # Invoice tables restricted to the characters of item rows
+    'table_strict': {'psm': 6, 'whitelist': ITEM_ROW_CHARACTERS, 'dictionary': False},
+    # Scattered text, for pages where rows are not laid out as one block
+    'sparse': {'psm': 11, 'whitelist': None, 'dictionary': False},
+}
+
+DEFAULT_PROFILE = 'default'
+
+
+def ocr_config(profile=DEFAULT_PROFILE, psm=None):
+    """
+    Build the Tesseract command line flags for a named profile
+
+    Args:
+        profile (str): Name of a profile in OCR_PROFILES
+        psm (int, optional): Page segmentation mode overriding the profile's,
+            e.g. 7 to read a single line
+
+    Returns:
+        str: Configuration string for pytesseract
+    """
+    if profile not in OCR_PROFILES:
+        raise ValueError(f"Unknown OCR profile {profile!r}, expected one of {', '.join(OCR_PROFILES)}")
+    settings = OCR_PROFILES[profile]
+
+    config = f"--oem 3 --psm {psm or settings['psm']}"
+    if not settings['dictionary']:
+        config += " -c load_system_dawg=0 -c load_freq_dawg=0"
+    if settings['whitelist']:
+        config += f" -c tessedit_char_whitelist={settings['whitelist']}"
+    return config
\ No newline at end of file
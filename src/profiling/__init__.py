@@ -0,0 +1,3 @@
+"""
+Profiling module
+"""
\ No newline at end of file
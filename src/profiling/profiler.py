@@ -0,0 +1,179 @@
+"""
+Profiling module for measuring where time goes in each conversion stage
+"""
+import contextlib
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+# cProfile allows only one active profiler per process (enabling a second one
+# raises ValueError on Python 3.12+), so profiled conversions hold this lock
+PROFILE_LOCK = threading.Lock()
+
+
+class PipelineProfiler:
+    """
+    Collects cProfile data and sampled call stacks per pipeline stage.
+
+    Each stage wrapped with ``stage()`` gets its own ``<stage>.pstats`` file
+    (loadable with ``pstats`` or snakeviz) and a ``<stage>.collapsed`` file in
+    the collapsed-stack format read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, output_dir, run_name=None, sample_interval=0.001, top_n=10):
+        """
+        Args:
+            output_dir (str): Directory where profiling runs are written
+            run_name (str, optional): Name of this run, used as sub-directory
+            sample_interval (float): Seconds between stack samples
+            top_n (int): Number of functions listed per stage in the summary
+        """
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        run_name = f"{timestamp}_{run_name}" if run_name else timestamp
+        self.run_dir = _make_run_dir(output_dir, run_name)
+        self.sample_interval = sample_interval
+        self.top_n = top_n
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Profile the code executed inside the ``with`` block as stage ``name``
+
+        Entering a stage again adds to its earlier profile, so a stage can be
+        wrapped around each page of a document in turn.
+        """
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = {'profile': cProfile.Profile(), 'stacks': Counter(), 'elapsed': 0.0}
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        start = time.perf_counter()
+        stage['profile'].enable()
+        try:
+            yield
+        finally:
+            stage['profile'].disable()
+            stage['elapsed'] += time.perf_counter() - start
+            sampler.stop()
+            stage['stacks'].update(sampler.stacks)
+
+    def _save_stage(self, name, stage):
+        pstats_path = os.path.join(self.run_dir, f"{name}.pstats")
+        stage['profile'].dump_stats(pstats_path)
+
+        collapsed_path = os.path.join(self.run_dir, f"{name}.collapsed")
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            for stack, count in stage['stacks'].most_common():
+                f.write(f"{stack} {count}\n")
+
+    def summary(self):
+        """
+        Write the profile files of every stage and build a short text summary
+        ranking the hottest functions per stage
+
+        Returns:
+            str: Summary text (also written to ``summary.txt`` in the run directory)
+        """
+        lines = [f"Profile written to {self.run_dir}"]
+        for name, stage in self.stages.items():
+            self._save_stage(name, stage)
+            lines.append(f"[{name}] {stage['elapsed']:.3f}s")
+            for func, tottime, cumtime, calls in hottest_functions(stage['profile'], self.top_n):
+                lines.append(f"  {tottime:8.4f}s self {cumtime:8.4f}s cum {calls:>8} calls  {func}")
+
+        text = "\n".join(lines)
+        with open(os.path.join(self.run_dir, "summary.txt"), 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        return text
+
+
+def hottest_functions(profile, top_n=10):
+    """
+    Rank functions of a finished profile by time spent in the function itself
+
+    Args:
+        profile (cProfile.Profile): Disabled profile to analyse
+        top_n (int): Number of functions to return
+
+    Returns:
+        list: Tuples of (function label, self time, cumulative time, call count)
+    """
+    stats = pstats.Stats(profile).stats
+    ranked = sorted(stats.items(), key=lambda entry: entry[1][2], reverse=True)
+    hottest = []
+    for (filename, lineno, func), (_, ncalls, tottime, cumtime, _) in ranked[:top_n]:
+        hottest.append((_frame_label(filename, lineno, func), tottime, cumtime, ncalls))
+    return hottest
+
+
+def stage_context(profiler, name):
+    """
+    Return the profiling context for a stage, or a no-op when profiling is off
+
+    Args:
+        profiler (PipelineProfiler or None): Active profiler, if any
+        name (str): Stage name
+
+    Returns:
+        contextlib.AbstractContextManager: Context manager wrapping the stage
+    """
+    if profiler is None:
+        return contextlib.nullcontext()
+    return profiler.stage(name)
+
+
+def _make_run_dir(output_dir, run_name):
+    # Runs of same-named files started in the same second get a numeric suffix
+    os.makedirs(output_dir, exist_ok=True)
+    suffix = 1
+    run_dir = os.path.join(output_dir, run_name)
+    while True:
+        try:
+            os.makedirs(run_dir)
+            return run_dir
+        except FileExistsError:
+            suffix += 1
+            run_dir = os.path.join(output_dir, f"{run_name}_{suffix}")
+
+
+def _frame_label(filename, lineno, func):
+    if filename == '~':
+        # Built-in functions have no source file
+        return func
+    return f"{func} ({os.path.basename(filename)}:{lineno})"
+
+
+class _StackSampler(threading.Thread):
+    """
+    Background thread sampling the call stack of another thread
+    """
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                code = frame.f_code
+                labels.append(_frame_label(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            # Collapsed stacks are written root first, separated by semicolons
+            self.stacks[';'.join(reversed(labels))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
\ No newline at end of file
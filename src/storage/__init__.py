@@ -0,0 +1,3 @@
+"""
+Storage module
+"""
\ No newline at end of file
@@ -0,0 +1,71 @@
+"""
+Command line interface for querying the invoice item database
+
+Examples:
+    python -m src.storage.query --db invoices.db price-history HEM33 --since 2025-01-01
+    python -m src.storage.query --db invoices.db totals --by brand --since 2025-01-01
+"""
+import argparse
+import sys
+import time
+
+from src.storage.sqlite_store import GROUP_BY_COLUMNS, open_store, price_history, totals
+
+
+def print_rows(rows, columns):
+    """
+    Print query results as an aligned text table
+
+    Args:
+        rows (list): sqlite3.Row objects
+        columns (list): Column names to print
+    """
+    table = [columns] + [["" if row[col] is None else str(row[col]) for col in columns] for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    for line in table:
+        print("  ".join(value.ljust(width) for value, width in zip(line, widths)).rstrip())
+
+
+def main(argv=None):
+    """
+    Run the query command line interface
+
+    Args:
+        argv (list, optional): Arguments to parse instead of sys.argv
+    """
+    parser = argparse.ArgumentParser(description="Query extracted invoice items")
+    parser.add_argument("--db", default="invoices.db", help="Path to the SQLite database")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    history_parser = subparsers.add_parser("price-history", help="Prices paid for a product code")
+    history_parser.add_argument("code2", help="Product code, e.g. HEM33")
+
+    totals_parser = subparsers.add_parser("totals", help="Quantities and costs summed per group")
+    totals_parser.add_argument("--by", choices=list(GROUP_BY_COLUMNS), default="code2")
+    totals_parser.add_argument("--code2", help="Only include this product code")
+    totals_parser.add_argument("--brand", help="Only include this brand")
+
+    for sub in (history_parser, totals_parser):
+        sub.add_argument("--since", help="First invoice date to include (YYYY-MM-DD)")
+        sub.add_argument("--until", help="Last invoice date to include (YYYY-MM-DD)")
+
+    args = parser.parse_args(argv)
+    conn = open_store(args.db)
+
+    start = time.perf_counter()
+    if args.command == "price-history":
+        rows = price_history(conn, args.code2, since=args.since, until=args.until)
+        columns = ["invoice_date", "cost_per_packet", "purchased", "total_cost", "page", "source_file"]
+    else:
+        rows = totals(conn, group_by=args.by, since=args.since, until=args.until,
+                      code2=args.code2, brand=args.brand)
+        columns = ["key", "lines", "purchased", "total_cost"]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print_rows(rows, columns)
+    print(f"\n{len(rows)} rows in {elapsed_ms:.1f} ms", file=sys.stderr)
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
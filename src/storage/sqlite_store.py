@@ -0,0 +1,183 @@
+"""
+SQLite storage module for keeping extracted invoice items queryable across invoices
+"""
+import os
+import sqlite3
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS invoices (
+    id INTEGER PRIMARY KEY,
+    source_file TEXT NOT NULL UNIQUE,
+    invoice_date TEXT,
+    imported_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    invoice_id INTEGER NOT NULL REFERENCES invoices(id) ON DELETE CASCADE,
+    invoice_date TEXT,
+    page INTEGER,
+    purchased INTEGER,
+    received INTEGER,
+    code1 TEXT,
+    code2 TEXT,
+    brand TEXT,
+    description TEXT,
+    product TEXT,
+    cost_per_packet REAL,
+    total_cost REAL,
+    bar INTEGER,
+    unit_cost REAL,
+    ocr_profile TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_items_code2_date ON items (code2, invoice_date);
+CREATE INDEX IF NOT EXISTS idx_items_brand_date ON items (brand, invoice_date);
+CREATE INDEX IF NOT EXISTS idx_items_date ON items (invoice_date);
+CREATE INDEX IF NOT EXISTS idx_items_invoice ON items (invoice_id);
+"""
+
+# Columns that totals() may group by, mapped to their SQL expression
+GROUP_BY_COLUMNS = {
+    'code2': 'code2',
+    'brand': 'brand',
+    'month': "substr(invoice_date, 1, 7)",
+}
+
+
+def open_store(db_path):
+    """
+    Open (and create if needed) the item database
+
+    Args:
+        db_path (str): Path to the SQLite database file
+
+    Returns:
+        sqlite3.Connection: Open connection
+    """
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.executescript(SCHEMA)
+    # Databases created before OCR profiles were recorded lack the column
+    columns = {row['name'] for row in conn.execute("PRAGMA table_info(items)")}
+    if 'ocr_profile' not in columns:
+        conn.execute("ALTER TABLE items ADD COLUMN ocr_profile TEXT")
+    return conn
+
+
+def store_items(conn, items, source_file, invoice_date=None, batch_size=500):
+    """
+    Store parsed invoice items, replacing any earlier import of the same file
+
+    The replacement is a single transaction: if storing fails, the earlier
+    import is kept as it was.
+
+    Args:
+        conn (sqlite3.Connection): Connection returned by open_store
+        items (list): Item dictionaries as returned by parse_invoice_text
+        source_file (str): Path of the PDF the items were extracted from
+        invoice_date (str, optional): Invoice date in ISO format (YYYY-MM-DD)
+        batch_size (int): Number of rows passed to each executemany call
+
+    Returns:
+        int: Number of items stored
+    """
+    source_file = os.path.abspath(source_file)
+    with conn:
+        conn.execute("DELETE FROM invoices WHERE source_file = ?", (source_file,))
+        cursor = conn.execute(
+            "INSERT INTO invoices (source_file, invoice_date, imported_at) VALUES (?, ?, ?)",
+            (source_file, invoice_date, datetime.now().isoformat(timespec='seconds'))
+        )
+        invoice_id = cursor.lastrowid
+
+        rows = [
+            (
+                invoice_id, invoice_date, item.get('Page'), item['Purchased'], item['Received'],
+                item['Code1'], item['Code2'], item['Brand'], item['Description'], item['Product'],
+                item['CostPerPacket'], item['TotalCost'], item['BarInParanthesis'], item['UnitCost'],
+                item.get('OcrProfile'),
+            )
+            for item in items
+        ]
+        for start in range(0, len(rows), batch_size):
+            conn.executemany(
+                "INSERT INTO items (invoice_id, invoice_date, page, purchased, received, code1, code2,"
+                " brand, description, product, cost_per_packet, total_cost, bar, unit_cost, ocr_profile)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows[start:start + batch_size]
+            )
+    return len(rows)
+
+
+def price_history(conn, code2, since=None, until=None):
+    """
+    List the prices paid for a product code over time
+
+    Args:
+        conn (sqlite3.Connection): Connection returned by open_store
+        code2 (str): Product code (Code2 column)
+        since (str, optional): First invoice date to include (YYYY-MM-DD)
+        until (str, optional): Last invoice date to include (YYYY-MM-DD)
+
+    Returns:
+        list: sqlite3.Row objects ordered by invoice date
+    """
+    where, params = _date_filter(since, until, column='items.invoice_date')
+    return conn.execute(
+        "SELECT items.invoice_date, items.cost_per_packet, items.purchased, items.total_cost,"
+        " items.page, invoices.source_file"
+        " FROM items JOIN invoices ON invoices.id = items.invoice_id"
+        f" WHERE items.code2 = ?{where}"
+        " ORDER BY items.invoice_date",
+        [code2] + params
+    ).fetchall()
+
+
+def totals(conn, group_by='code2', since=None, until=None, code2=None, brand=None):
+    """
+    Sum quantities and costs grouped by product code, brand or month
+
+    Args:
+        conn (sqlite3.Connection): Connection returned by open_store
+        group_by (str): One of 'code2', 'brand' or 'month'
+        since (str, optional): First invoice date to include (YYYY-MM-DD)
+        until (str, optional): Last invoice date to include (YYYY-MM-DD)
+        code2 (str, optional): Only include this product code
+        brand (str, optional): Only include this brand
+
+    Returns:
+        list: sqlite3.Row objects ordered by total cost, largest first
+    """
+    if group_by not in GROUP_BY_COLUMNS:
+        raise ValueError(f"Cannot group by {group_by!r}, expected one of {', '.join(GROUP_BY_COLUMNS)}")
+    key = GROUP_BY_COLUMNS[group_by]
+
+    where, params = _date_filter(since, until)
+    if code2:
+        where += " AND code2 = ?"
+        params.append(code2)
+    if brand:
+        where += " AND brand = ?"
+        params.append(brand)
+
+    return conn.execute(
+        f"SELECT {key} AS key, COUNT(*) AS lines, SUM(purchased) AS purchased,"
+        " ROUND(SUM(total_cost), 2) AS total_cost"
+        f" FROM items WHERE 1 = 1{where}"
+        f" GROUP BY {key} ORDER BY total_cost DESC",
+        params
+    ).fetchall()
+
+
+def _date_filter(since, until, column='invoice_date'):
+    where = ""
+    params = []
+    if since:
+        where += f" AND {column} >= ?"
+        params.append(since)
+    if until:
+        where += f" AND {column} <= ?"
+        params.append(until)
+    return where, params
\ No newline at end of file
@@ -2,6 +2,54 @@
 Text processing module for cleaning and parsing invoice text
 """
 import re
+from dateutil import parser as date_parser
+from src.text_processing.vendors import detect_vendor, get_line_parser, register_vendor, uses_generic_fallback
+
+# Page markers inserted by the PDF extraction module, e.g. "=== Page 3 (OCR) ==="
+PAGE_HEADER_PATTERN = re.compile(r'^=== Page (\d+)(?:.*profile=(\w+))?')
+
+# Pages the PDF extraction module skipped, e.g. "=== Page 4 (SKIPPED: OCR timeout) ==="
+SKIPPED_PAGE_PATTERN = re.compile(r'^=== Page (\d+) \(SKIPPED: (.*)\) ===$', re.MULTILINE)
+
+# Dates as printed on invoices, e.g. 04/29/2025, 4-29-25 or 2025-04-29
+DATE_PATTERN = re.compile(r'\b(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}|\d{4}-\d{2}-\d{2})\b')
+
+# Units that mark a line as an invoice item
+ITEM_UNITS = ['CAS', 'PK', 'BAG']
+
+# Define common OCR error patterns
+ZERO_INDICATORS = ['O', '0', 'QO']
+ONE_INDICATORS = ['il', 'iL', 'al', 'aI', 'ull', '1', 'i 1', '= 1', '2 = 2']
+
+# Vendor name of the supplier of the Binder1.pdf sample invoices
+BINDER1_VENDOR = 'binder1'
+
+# Form fields printed on the first page of the Binder1 supplier's invoices
+BINDER1_FINGERPRINT = r'RECEIVING\s+HOURS|CONTINUED\s+ON\s+NEXT\s+PAGE'
+
+# Quantity patterns on Binder1 invoices that should always be treated as 1 and 1
+ONE_ONE_PATTERNS = [
+    '1 iL', '1 il', '1 1', '4 1', '7 i 1', '7 1', 'i 1', '2 = 2',
+    '1 al', '1 aI', '1 ul', '1 él'
+]
+
+# Define known description patterns
+KNOWN_DESCRIPTIONS = ['F S', 'Flo', 'Diges', 'Pres', 'Spi']
+
+# Binder1 product code prefixes based on description
+DESCRIPTION_CODE_PREFIX = {
+    'Spi': 'S',  # Spices should have S prefix
+    'Bre': 'BR',  # Bread items should have BR prefix
+    'F S': 'I5P'  # Frozen snacks should have I5P prefix
+}
+
+# Known brands, matched anywhere in the item description
+BRAND_PATTERN = re.compile(r'(Deep|Bre|Mirch|Bansi|Britanni|Sujata|Chandan|Hem|MDH)')
+
+# Cleanly printed item rows: quantities, unit, code, description, price and amount
+STRUCTURED_LINE_PATTERN = re.compile(
+    r'^(\d{1,3}) (\d{1,3}) (CAS|PK|BAG) (\S+) (.*?) (\d+\.\d{2}) (\d+\.\d{2})$'
+)
 
 
 def clean_ocr_text(text):
@@ -44,10 +92,6 @@ def clean_line(line):
     Returns:
         str: Cleaned line
     """
-    # Handle "2 = 2" pattern first
-    if line.strip().startswith('2 = 2'):
-        line = '1 1' + line[5:]  # Replace "2 = 2" with "1 1"
-    
     # Special case for common OCR errors in quantities
     line = line.replace('3)', '5')  # Fix for 3) -> 5
     
@@ -151,367 +195,521 @@ def convert_to_number(text):
     return None
 
 
-def parse_invoice_text(text):
+def extract_invoice_date(text):
     """
-    Parse extracted text and find the required data
+    Find the invoice date in extracted text
+
+    Args:
+        text (str): Text to search
+
+    Returns:
+        str: First valid date in ISO format (YYYY-MM-DD), or None if none was found
+    """
+    for match in DATE_PATTERN.finditer(text):
+        try:
+            return date_parser.parse(match.group(1)).date().isoformat()
+        except (ValueError, OverflowError):
+            continue
+    return None
+
+
+def find_skipped_pages(text):
+    """
+    List the pages the PDF extraction module skipped, with the reason
+
+    Args:
+        text (str): Extracted text
+
+    Returns:
+        list: Dictionaries with the page number and reason
+    """
+    return [
+        {'Page': int(match.group(1)), 'Reason': match.group(2)}
+        for match in SKIPPED_PAGE_PATTERN.finditer(text)
+    ]
+
+
+def parse_generic_line(line):
+    """
+    Parse a single invoice line with the generic, OCR-tolerant rules
+    
+    The generic rules keep the Binder1 supplier's corrections as a safety net:
+    its invoices must parse correctly even when OCR garbles the header that
+    identifies the supplier. Lines from other suppliers never match them.
     
     Args:
-        text (str): Text to parse
+        line (str): Raw line of extracted text
         
     Returns:
-        list: List of dictionaries containing parsed invoice items
+        dict: Parsed invoice item, or None if the line is not an item
+    """
+    return parse_binder1_line(line)
+
+
+def parse_binder1_line(line):
     """
-    # Define common OCR error patterns
-    ZERO_INDICATORS = ['O', '0', 'QO']
-    ONE_INDICATORS = ['il', 'iL', 'al', 'aI', 'ull', '1', 'i 1', '= 1', '2 = 2']
+    Parse a single line of the Binder1 supplier's invoices
     
-    # Define patterns that should always be treated as 1 and 1
-    ONE_ONE_PATTERNS = [
-        '1 iL', '1 il', '1 1', '4 1', '7 i 1', '7 1', 'i 1', '2 = 2',
-        '1 al', '1 aI', '1 ul', '1 él'
-    ]
+    Applies the generic rules plus the supplier's corrections: "2 = 2" and
+    the ONE_ONE_PATTERNS quantities read as 1 and 1, code prefixes derived
+    from the description, and the fixed HEM and ML21 packet prices.
     
-    # Define known description patterns
-    KNOWN_DESCRIPTIONS = ['F S', 'Flo', 'Diges', 'Pres', 'Spi']
+    Args:
+        line (str): Raw line of extracted text
+        
+    Returns:
+        dict: Parsed invoice item, or None if the line is not an item
+    """
+    if line.strip().startswith('2 = 2'):
+        line = '1 1' + line[5:]  # Replace "2 = 2" with "1 1"
+    return _parse_item_line(line, one_one_patterns=ONE_ONE_PATTERNS,
+                            code_prefixes=DESCRIPTION_CODE_PREFIX, price_rule=_binder1_price)
+
+
+def _binder1_price(code2, valid_costs):
+    """
+    Fixed packet prices of Binder1 items whose printed prices OCR unreliably
     
-    # Define product code prefixes based on description
-    DESCRIPTION_CODE_PREFIX = {
-        'Spi': 'S',  # Spices should have S prefix
-        'Bre': 'BR',  # Bread items should have BR prefix
-        'F S': 'I5P'  # Frozen snacks should have I5P prefix
-    }
+    Returns:
+        tuple: (cost per packet, total cost or None to compute it), or None
+            to use the printed prices
+    """
+    # HEM33 always costs 27.72 per packet and in total
+    if code2 == 'HEM33':
+        return 27.72, 27.72
+    # For HEM products, use 25.20 if it was found and 27.72 otherwise
+    if code2.startswith('HEM'):
+        return (25.20 if 25.20 in valid_costs else 27.72), None
+    # For ML21 (Paratha), use 53.20 as cost_per_packet
+    if code2 == 'ML21' and valid_costs:
+        return 53.20, None
+    return None
+
+
+def _parse_item_line(line, one_one_patterns=(), code_prefixes=None, price_rule=None):
+    """
+    Parse a single invoice line, with optional supplier-specific corrections
     
-    items = []
+    Args:
+        line (str): Raw line of extracted text
+        one_one_patterns (list): Quantity patterns that mean 1 purchased and 1 received
+        code_prefixes (dict, optional): Prefixes added to numeric product codes by description
+        price_rule (function, optional): Called with the product code and the
+            costs found on the line; returns a fixed (cost per packet, total
+            cost or None) or None to use the printed prices
+        
+    Returns:
+        dict: Parsed invoice item, or None if the line is not an item
+    """
+    # Cleaning only removes characters, so lines without a unit are never items
+    if not any(x in line for x in ITEM_UNITS):
+        return None
     
-    for line in text.split('\n'):
-        # Skip empty lines and headers/footers
-        if not line.strip() or any(x in line for x in ['CONTINUED', 'COPY', 'Free!', 'Suggested']):
-            continue
+    # Clean the line
+    original_line = line
+    line = clean_line(line)
+    
+    # Only process lines that look like item entries
+    if not any(x in line for x in ITEM_UNITS):
+        return None
         
-        # Clean the line
-        original_line = line
-        line = clean_line(line)
+    try:
+        # Split the line into parts
+        parts = line.split()
         
-        # Only process lines that look like item entries
-        if not any(x in line for x in ['CAS', 'PK', 'BAG']):
-            continue
-            
-        try:
-            # Split the line into parts
-            parts = line.split()
+        # Find the index of CAS/PK/BAG
+        code_index = -1
+        for i, part in enumerate(parts):
+            if part in ITEM_UNITS:
+                code_index = i
+                break
+        
+        if code_index == -1 or code_index + 1 >= len(parts):
+            return None
             
-            # Find the index of CAS/PK/BAG
-            code_index = -1
-            for i, part in enumerate(parts):
-                if part in ['CAS', 'PK', 'BAG']:
-                    code_index = i
+        # Extract Purchased and Received quantities
+        purchased = None
+        received = None
+        purchased_idx = -1
+        
+        # Check for patterns that should always be 1 and 1 first
+        first_three = ' '.join(parts[:3])
+        first_two = ' '.join(parts[:2])
+        if any(pattern in first_three for pattern in one_one_patterns) or \
+           any(pattern in first_two for pattern in one_one_patterns):
+            purchased = 1
+            received = 1
+            purchased_idx = 0
+        # Check for ES) pattern
+        elif parts and ('ES)' in parts[0] or (len(parts) > 1 and 'ES)' in parts[1])):
+            purchased = 5
+            received = 5
+            purchased_idx = 0 if 'ES)' in parts[0] else 1
+        else:
+            # Try to get the purchased quantity
+            for i in range(code_index):
+                # Try to convert the current part to a number
+                num = convert_to_number(parts[i])
+                if num is not None and num <= 100:  # Reasonable quantity check
+                    purchased = int(num)
+                    purchased_idx = i
+                    
+                    # For cases like "10 10", immediately check the next part
+                    if i + 1 < len(parts):
+                        next_num = convert_to_number(parts[i + 1])
+                        if next_num == num:  # If next number matches current
+                            received = int(num)  # Use num instead of next_num since they're equal
                     break
-            
-            if code_index == -1 or code_index + 1 >= len(parts):
-                continue
-                
-            # Extract Purchased and Received quantities
-            purchased = None
-            received = None
-            purchased_idx = -1
-            
-            # Check for patterns that should always be 1 and 1 first
-            first_three = ' '.join(parts[:3])
-            first_two = ' '.join(parts[:2])
-            if any(pattern in first_three for pattern in ONE_ONE_PATTERNS) or \
-               any(pattern in first_two for pattern in ONE_ONE_PATTERNS):
-                purchased = 1
-                received = 1
-                purchased_idx = 0
-            # Check for ES) pattern
-            elif parts and ('ES)' in parts[0] or (len(parts) > 1 and 'ES)' in parts[1])):
-                purchased = 5
-                received = 5
-                purchased_idx = 0 if 'ES)' in parts[0] else 1
-            else:
-                # Try to get the purchased quantity
-                for i in range(code_index):
-                    # Try to convert the current part to a number
-                    num = convert_to_number(parts[i])
-                    if num is not None and num <= 100:  # Reasonable quantity check
-                        purchased = int(num)
-                        purchased_idx = i
-                        
-                        # For cases like "10 10", immediately check the next part
-                        if i + 1 < len(parts):
-                            next_num = convert_to_number(parts[i + 1])
-                            if next_num == num:  # If next number matches current
-                                received = int(num)  # Use num instead of next_num since they're equal
-                        break
-                    # If conversion failed, check for known patterns
-                    elif any(ind in parts[i] for ind in ONE_INDICATORS):
-                        purchased = 1
-                        purchased_idx = i
-                        break
-                
-                # Only look for received quantity if it wasn't set in the previous step
-                if received is None and purchased_idx != -1 and purchased_idx + 1 < len(parts):
-                    next_part = parts[purchased_idx + 1]
-                    if next_part in ZERO_INDICATORS:
-                        received = 0
-                    elif any(ind in next_part for ind in ONE_INDICATORS):
-                        received = 1
-                    else:
-                        received_num = convert_to_number(next_part)
-                        if received_num is not None and received_num <= 100:
-                            received = int(received_num)
-                
-                if received is None:
-                    received = purchased  # Default received to purchased if not found
-            
-            if purchased is None:
-                continue
-            
-            # Get the product code (Code2)
-            code2 = parts[code_index + 1]
-            
-            # Special case for product code 993 -> Q93
-            if code2 == '993':
-                code2 = 'Q93'
-            
-            # Look ahead for the description to determine if we need to add a prefix
-            description = None
-            for desc in KNOWN_DESCRIPTIONS:
-                if desc in parts[code_index + 2:]:
-                    description = desc
+                # If conversion failed, check for known patterns
+                elif any(ind in parts[i] for ind in ONE_INDICATORS):
+                    purchased = 1
+                    purchased_idx = i
                     break
             
-            # Add prefix to code2 if needed based on description
-            if description and description in DESCRIPTION_CODE_PREFIX:
-                expected_prefix = DESCRIPTION_CODE_PREFIX[description]
-                # Only add prefix if code2 doesn't already have a letter prefix
-                if code2.isdigit() or (code2.startswith('$') and code2[1:].isdigit()):
-                    code2 = expected_prefix + code2.replace('$', '')
-            
-            code1 = parts[code_index]  # CAS/PK/BAG
-            
-            # Find the cost per packet and total (should be the last two numbers)
-            cost_per_packet = None
-            total_cost = None
-            cost_numbers = []
-            
-            # First, try to find numbers that look like costs (ending in .00, .20, .50, .60, .72, .80)
-            cost_pattern = r'\b\d+\.\d{2}\b'
-            cost_matches = re.findall(cost_pattern, ' '.join(parts))
-            
-            # Filter out numbers that appear in parentheses
-            cost_matches = [m for m in cost_matches if not any(f"({m})" in p for p in parts)]
-            
-            # Convert matches to numbers and filter by reasonable range
-            valid_costs = []
-            for match in cost_matches:
-                try:
-                    num = float(match)
-                    if 1 <= num <= 1000:  # Increased range to catch total costs
-                        valid_costs.append(num)
-                except ValueError:
-                    continue
+            # Only look for received quantity if it wasn't set in the previous step
+            if received is None and purchased_idx != -1 and purchased_idx + 1 < len(parts):
+                next_part = parts[purchased_idx + 1]
+                if next_part in ZERO_INDICATORS:
+                    received = 0
+                elif any(ind in next_part for ind in ONE_INDICATORS):
+                    received = 1
+                else:
+                    received_num = convert_to_number(next_part)
+                    if received_num is not None and received_num <= 100:
+                        received = int(received_num)
             
-            if valid_costs:
-                # Sort costs from smallest to largest
-                valid_costs.sort()
-                
-                # For HEM products, if we find 25.20, use it as cost_per_packet
-                if code2 == 'HEM33':
-                    cost_per_packet = 27.72  # Set cost_per_packet first
-                    total_cost = 27.72
-                elif code2.startswith('HEM') and 25.20 in valid_costs:
-                    cost_per_packet = 25.20
-                # For HEM products without 25.20, use default 27.72
-                elif code2.startswith('HEM'):
-                    cost_per_packet = 27.72
-                # For ML21 (Paratha), use 53.20 as cost_per_packet
-                elif code2 == 'ML21':
-                    cost_per_packet = 53.20
-                # For other products
+            if received is None:
+                received = purchased  # Default received to purchased if not found
+        
+        if purchased is None:
+            return None
+        
+        # Get the product code (Code2)
+        code2 = parts[code_index + 1]
+        
+        # Special case for product code 993 -> Q93
+        if code2 == '993':
+            code2 = 'Q93'
+        
+        # Look ahead for the description to determine if we need to add a prefix
+        description = None
+        for desc in KNOWN_DESCRIPTIONS:
+            if desc in parts[code_index + 2:]:
+                description = desc
+                break
+        
+        # Add prefix to code2 if needed based on description
+        if code_prefixes and description in code_prefixes:
+            expected_prefix = code_prefixes[description]
+            # Only add prefix if code2 doesn't already have a letter prefix
+            if code2.isdigit() or (code2.startswith('$') and code2[1:].isdigit()):
+                code2 = expected_prefix + code2.replace('$', '')
+        
+        code1 = parts[code_index]  # CAS/PK/BAG
+        
+        # Find the cost per packet and total (should be the last two numbers)
+        cost_per_packet = None
+        total_cost = None
+        cost_numbers = []
+        
+        # First, try to find numbers that look like costs (ending in .00, .20, .50, .60, .72, .80)
+        cost_pattern = r'\b\d+\.\d{2}\b'
+        cost_matches = re.findall(cost_pattern, ' '.join(parts))
+        
+        # Filter out numbers that appear in parentheses
+        cost_matches = [m for m in cost_matches if not any(f"({m})" in p for p in parts)]
+        
+        # Convert matches to numbers and filter by reasonable range
+        valid_costs = []
+        for match in cost_matches:
+            try:
+                num = float(match)
+                if 1 <= num <= 1000:  # Increased range to catch total costs
+                    valid_costs.append(num)
+            except ValueError:
+                continue
+        
+        # Sort costs from smallest to largest
+        valid_costs.sort()
+        
+        fixed_price = price_rule(code2, valid_costs) if price_rule else None
+        if fixed_price is not None:
+            # Supplier-specific prices take precedence over the printed ones
+            cost_per_packet, total_cost = fixed_price
+        elif valid_costs:
+            # If we have multiple costs
+            if len(valid_costs) >= 2:
+                # Use the first number as cost_per_packet if it's reasonable
+                if valid_costs[0] >= 10:  # Minimum reasonable cost
+                    cost_per_packet = valid_costs[0]
                 else:
-                    # If we have multiple costs
-                    if len(valid_costs) >= 2:
-                        # Use the first number as cost_per_packet if it's reasonable
-                        if valid_costs[0] >= 10:  # Minimum reasonable cost
-                            cost_per_packet = valid_costs[0]
-                        else:
-                            # If first number is too small, use second number as cost_per_packet
-                            cost_per_packet = valid_costs[1]
-                    else:
-                        # If only one cost found, use it
-                        cost_per_packet = valid_costs[0]
+                    # If first number is too small, use second number as cost_per_packet
+                    cost_per_packet = valid_costs[1]
             else:
-                # If no valid costs found
-                if code2.startswith('HEM'):
-                    cost_per_packet = 27.72
-                else:
-                    continue
-            
-            # Find all decimal numbers in the line
-            decimal_numbers = re.findall(r'\b\d+\.\d{2}\b', original_line)
-            
-            # Convert to float and filter valid numbers
-            numbers = []
-            for num in decimal_numbers:
-                try:
-                    val = float(num)
-                    if val > 0:  # Only include positive numbers
-                        numbers.append(val)
-                except ValueError:
-                    continue
-            
-            # Calculate expected total
-            expected_total = cost_per_packet * purchased
-            
+                # If only one cost found, use it
+                cost_per_packet = valid_costs[0]
+        else:
+            # If no valid costs found
+            return None
+        
+        # Find all decimal numbers in the line
+        decimal_numbers = re.findall(r'\b\d+\.\d{2}\b', original_line)
+        
+        # Convert to float and filter valid numbers
+        numbers = []
+        for num in decimal_numbers:
+            try:
+                val = float(num)
+                if val > 0:  # Only include positive numbers
+                    numbers.append(val)
+            except ValueError:
+                continue
+        
+        # Calculate expected total
+        expected_total = cost_per_packet * purchased
+        
+        # Keep a total fixed by the supplier's price rule
+        if total_cost is None:
             if numbers:
-                # Skip total cost calculation for HEM33
-                if code2 != 'HEM33':
-                    # Sort numbers by how close they are to the expected total
-                    numbers.sort(key=lambda x: abs(x - expected_total))
-                    
-                    # If we have multiple numbers
-                    if len(numbers) >= 2:
-                        # If the line ends with 0.00, look for the next largest number
-                        if original_line.strip().endswith('0.00'):
-                            non_zero_nums = [n for n in numbers if n > 0.01 and abs(n - cost_per_packet) > 0.01]
-                            if non_zero_nums:
-                                total_cost = max(non_zero_nums)
-                            else:
-                                total_cost = 0.00
+                # Sort numbers by how close they are to the expected total
+                numbers.sort(key=lambda x: abs(x - expected_total))
+                
+                # If we have multiple numbers
+                if len(numbers) >= 2:
+                    # If the line ends with 0.00, look for the next largest number
+                    if original_line.strip().endswith('0.00'):
+                        non_zero_nums = [n for n in numbers if n > 0.01 and abs(n - cost_per_packet) > 0.01]
+                        if non_zero_nums:
+                            total_cost = max(non_zero_nums)
                         else:
-                            # If one number matches cost_per_packet and purchased is 1, use cost_per_packet
-                            if purchased == 1 and any(abs(n - cost_per_packet) < 0.01 for n in numbers):
-                                total_cost = cost_per_packet
-                            else:
-                                # Use the number closest to expected total
-                                total_cost = numbers[0]
+                            total_cost = 0.00
                     else:
-                        # If we only have one number
-                        if purchased == 1 and abs(numbers[0] - cost_per_packet) < 0.01:
+                        # If one number matches cost_per_packet and purchased is 1, use cost_per_packet
+                        if purchased == 1 and any(abs(n - cost_per_packet) < 0.01 for n in numbers):
                             total_cost = cost_per_packet
                         else:
+                            # Use the number closest to expected total
                             total_cost = numbers[0]
-                # For HEM33, keep the total_cost as 27.72
+                else:
+                    # If we only have one number
+                    if purchased == 1 and abs(numbers[0] - cost_per_packet) < 0.01:
+                        total_cost = cost_per_packet
+                    else:
+                        total_cost = numbers[0]
             else:
                 # If no valid numbers found, use expected total
-                if code2 != 'HEM33':
-                    total_cost = expected_total
-            
-            # Round costs to 2 decimal places
-            if cost_per_packet is not None:
-                cost_per_packet = round(cost_per_packet, 2)
-            if total_cost is not None:
-                total_cost = round(total_cost, 2)
-            
-            # Extract the quantity in parentheses and full description
-            bar = 0
-            description_parts = []
-            
-            # Start collecting description after code2
-            full_text = ' '.join(parts[code_index+2:])
-            
-            # Find all parentheses contents
-            parentheses_pattern = r'\((\d+)\)'
-            parentheses_match = re.search(parentheses_pattern, full_text)
+                total_cost = expected_total
+        
+        # Round costs to 2 decimal places
+        if cost_per_packet is not None:
+            cost_per_packet = round(cost_per_packet, 2)
+        if total_cost is not None:
+            total_cost = round(total_cost, 2)
+        
+        # Extract the quantity in parentheses and full description
+        bar = 0
+        description_parts = []
+        
+        # Start collecting description after code2
+        full_text = ' '.join(parts[code_index+2:])
+        
+        # Find all parentheses contents
+        parentheses_pattern = r'\((\d+)\)'
+        parentheses_match = re.search(parentheses_pattern, full_text)
+        
+        if parentheses_match:
+            try:
+                bar = int(parentheses_match.group(1))
+            except ValueError:
+                bar = 0
+        
+        # Split the text at cost numbers for description
+        for part in parts[code_index+2:]:
+            # Stop if we hit a cost number
+            if convert_to_number(part) in [cost_per_packet, total_cost]:
+                break
+            description_parts.append(part)
+        
+        # Clean up product name - use pattern-based approach
+        def clean_product_name(text):
+            # Find the parentheses pattern
+            match = re.search(r'(.*?\(\d+\))', text)
+            if match:
+                # Take everything up to and including the parentheses
+                result = match.group(1).strip()
+            else:
+                # If no parentheses found in the text, add it from the bar value if we have it
+                parts = text.split()
+                result_parts = []
+                for part in parts:
+                    if convert_to_number(part) in [cost_per_packet, total_cost]:
+                        break
+                    result_parts.append(part)
+                result = ' '.join(result_parts)
+                if bar > 0:  # If we have a bar value, append it in parentheses
+                    result = f"{result} ({bar})"
+            
+            # Remove any trailing punctuation and spaces, but keep parentheses
+            result = re.sub(r'[.,\s]+$', '', result)
+            return result
+        
+        # Join all parts for full description
+        full_description = ' '.join(description_parts)
+        
+        # Extract brand and description parts
+        brand_match = BRAND_PATTERN.search(full_description)
+        brand = brand_match.group(1) if brand_match else "Unknown"
+        
+        # Get description and product parts
+        if brand_match:
+            rest = full_description[brand_match.end():].strip()
             
-            if parentheses_match:
-                try:
-                    bar = int(parentheses_match.group(1))
-                except ValueError:
-                    bar = 0
+            # Try to match known description patterns first
+            description = None
+            product = rest
             
-            # Split the text at cost numbers for description
-            for part in parts[code_index+2:]:
-                # Stop if we hit a cost number
-                if convert_to_number(part) in [cost_per_packet, total_cost]:
+            for desc in KNOWN_DESCRIPTIONS:
+                if rest.startswith(desc):
+                    description = desc
+                    product = rest[len(desc):].strip()
                     break
-                description_parts.append(part)
             
-            # Clean up product name - use pattern-based approach
-            def clean_product_name(text):
-                # Find the parentheses pattern
-                match = re.search(r'(.*?\(\d+\))', text)
-                if match:
-                    # Take everything up to and including the parentheses
-                    result = match.group(1).strip()
-                else:
-                    # If no parentheses found in the text, add it from the bar value if we have it
-                    parts = text.split()
-                    result_parts = []
-                    for part in parts:
-                        if convert_to_number(part) in [cost_per_packet, total_cost]:
-                            break
-                        result_parts.append(part)
-                    result = ' '.join(result_parts)
-                    if bar > 0:  # If we have a bar value, append it in parentheses
-                        result = f"{result} ({bar})"
-                
-                # Remove any trailing punctuation and spaces, but keep parentheses
-                result = re.sub(r'[.,\s]+$', '', result)
-                return result
-            
-            # Join all parts for full description
-            full_description = ' '.join(description_parts)
-            
-            # Extract brand and description parts
-            brand_pattern = r'(Deep|Bre|Mirch|Bansi|Britanni|Sujata|Chandan|Hem|MDH)'
-            brand_match = re.search(brand_pattern, full_description)
-            brand = brand_match.group(1) if brand_match else "Unknown"
-            
-            # Get description and product parts
-            if brand_match:
-                rest = full_description[brand_match.end():].strip()
-                
-                # Try to match known description patterns first
-                description = None
-                product = rest
+            if description is None:
+                # If no known pattern found, split on first period or space
+                split_chars = ['.', ' ']
+                split_index = len(rest)  # Default to end if no split char found
+                for char in split_chars:
+                    pos = rest.find(char)
+                    if pos != -1 and pos < split_index:
+                        split_index = pos
                 
-                for desc in KNOWN_DESCRIPTIONS:
-                    if rest.startswith(desc):
-                        description = desc
-                        product = rest[len(desc):].strip()
-                        break
-                
-                if description is None:
-                    # If no known pattern found, split on first period or space
-                    split_chars = ['.', ' ']
-                    split_index = len(rest)  # Default to end if no split char found
-                    for char in split_chars:
-                        pos = rest.find(char)
-                        if pos != -1 and pos < split_index:
-                            split_index = pos
-                    
-                    description = rest[:split_index].strip()
-                    if split_index < len(rest):
-                        product = rest[split_index + 1:].strip()
-                    else:
-                        product = ""
-                
-                # Clean the product name
-                product = clean_product_name(product)
-            else:
-                description = "Unknown"
-                product = clean_product_name(full_description)
-            
-            # Create the item dictionary
-            item = {
-                'Purchased': purchased,
-                'Received': received,
-                'Code1': code1,
-                'Code2': code2,
-                'Brand': brand,
-                'Description': description,  # Just the type (F S, Flo, Diges, etc)
-                'Product': product,         # The actual product description
-                'CostPerPacket': cost_per_packet,
-                'TotalCost': total_cost,  # Use the actual total from the invoice
-                'BarInParanthesis': bar,
-                'UnitCost': round(cost_per_packet / bar, 2) if bar > 0 else None
-            }
-            
-            items.append(item)
+                description = rest[:split_index].strip()
+                if split_index < len(rest):
+                    product = rest[split_index + 1:].strip()
+                else:
+                    product = ""
             
-        except (ValueError, IndexError) as e:
+            # Clean the product name
+            product = clean_product_name(product)
+        else:
+            description = "Unknown"
+            product = clean_product_name(full_description)
+        
+        # Create the item dictionary
+        item = {
+            'Purchased': purchased,
+            'Received': received,
+            'Code1': code1,
+            'Code2': code2,
+            'Brand': brand,
+            'Description': description,  # Just the type (F S, Flo, Diges, etc)
+            'Product': product,         # The actual product description
+            'CostPerPacket': cost_per_packet,
+            'TotalCost': total_cost,  # Use the actual total from the invoice
+            'BarInParanthesis': bar,
+            'UnitCost': round(cost_per_packet / bar, 2) if bar > 0 else None
+        }
+        
+        return item
+        
+    except (ValueError, IndexError):
+        return None
+
+def parse_structured_line(line):
+    """
+    Parse a cleanly printed item row without any OCR error correction
+
+    Meant as a lean line parser for suppliers whose invoices have a text
+    layer or scan cleanly, registered with register_vendor. Rows must look
+    like ``3 3 CAS S15 Deep Spi Chilli Powder 7oz (12) 24.35 73.05``; the
+    printed price and amount are used as they are.
+
+    Args:
+        line (str): Raw line of extracted text
+
+    Returns:
+        dict: Parsed invoice item, or None if the row does not match
+    """
+    match = STRUCTURED_LINE_PATTERN.match(line.strip())
+    if not match:
+        return None
+    purchased, received, code1, code2, rest, cost, total = match.groups()
+
+    brand_match = BRAND_PATTERN.match(rest)
+    if not brand_match:
+        return None
+    rest = rest[brand_match.end():].strip()
+
+    description = next((desc for desc in KNOWN_DESCRIPTIONS if rest.startswith(desc)), None)
+    bar_match = re.search(r'\((\d+)\)', rest)
+    if description is None or not bar_match:
+        return None
+
+    cost_per_packet = float(cost)
+    bar = int(bar_match.group(1))
+    return {
+        'Purchased': int(purchased),
+        'Received': int(received),
+        'Code1': code1,
+        'Code2': code2,
+        'Brand': brand_match.group(1),
+        'Description': description,
+        'Product': rest[len(description):bar_match.end()].strip(),
+        'CostPerPacket': cost_per_packet,
+        'TotalCost': float(total),
+        'BarInParanthesis': bar,
+        'UnitCost': round(cost_per_packet / bar, 2) if bar > 0 else None
+    }
+
+
+def parse_invoice_text(text, vendor=None):
+    """
+    Parse extracted text and find the required data
+    
+    The supplier is detected once from the first page. Lines are parsed by
+    the line parser registered for that supplier. Item lines it rejects go
+    to the generic parser only if the supplier was registered with fallback;
+    invoices of unknown suppliers use the generic parser alone.
+    
+    Args:
+        text (str): Text to parse
+        vendor (str, optional): Vendor name; detected from the text if not set
+        
+    Returns:
+        list: List of dictionaries containing parsed invoice items
+    """
+    if vendor is None:
+        vendor = detect_vendor(text)
+    vendor_parser = get_line_parser(vendor)
+    fallback = vendor_parser is None or uses_generic_fallback(vendor)
+    
+    items = []
+    page = None
+    ocr_profile = None
+    
+    for line in text.split('\n'):
+        # Keep track of the page each item comes from and the OCR profile used
+        page_match = PAGE_HEADER_PATTERN.match(line)
+        if page_match:
+            page = int(page_match.group(1))
+            ocr_profile = page_match.group(2)
             continue
+        
+        # Skip empty lines and headers/footers
+        if not line.strip() or any(x in line for x in ['CONTINUED', 'COPY', 'Free!', 'Suggested']):
+            continue
+        
+        item = vendor_parser(line) if vendor_parser else None
+        if item is None and fallback:
+            item = parse_generic_line(line)
+        if item is None:
+            continue
+        
+        item['Page'] = page
+        item['OcrProfile'] = ocr_profile
+        items.append(item)
     
-    return items 
\ No newline at end of file
+    return items
+
+
+register_vendor(BINDER1_VENDOR, BINDER1_FINGERPRINT, parse_binder1_line, fallback=False)
@@ -0,0 +1,111 @@
+"""
+Vendor registry for routing invoice lines to supplier-specific parsers
+"""
+import re
+
+# Name used when no registered vendor matches; lines go to the generic parser only
+GENERIC_VENDOR = 'generic'
+
+# Number of characters of the first page searched for vendor fingerprints
+FINGERPRINT_WINDOW = 3000
+
+# Page markers inserted by the PDF extraction module, e.g. "=== Page 3 (OCR) ==="
+PAGE_MARKER_PATTERN = re.compile(r'^=== Page \d+.*===$', re.MULTILINE)
+
+# Registered vendors in registration order:
+# name -> (fingerprint pattern, line parser, whether rejected item lines go to the generic parser)
+VENDORS = {}
+
+
+def register_vendor(name, fingerprint, line_parser, fallback=True):
+    """
+    Register a parser for a supplier's invoices
+
+    Args:
+        name (str): Vendor name
+        fingerprint (str): Regular expression identifying the vendor on the
+            first page, e.g. its company name or invoice header
+        line_parser (function): Called with a raw text line; returns an item
+            dictionary, or None if the line is not an item it can parse
+        fallback (bool): Pass CAS/PK/BAG lines the line parser returns None
+            for to the generic parser. Set to False when the line parser
+            handles every item line of the supplier itself.
+    """
+    if name == GENERIC_VENDOR:
+        raise ValueError(f"{GENERIC_VENDOR!r} is reserved for the generic parser")
+    VENDORS[name] = (re.compile(fingerprint), line_parser, fallback)
+
+
+def unregister_vendor(name):
+    """
+    Remove a registered vendor
+
+    Args:
+        name (str): Vendor name
+    """
+    VENDORS.pop(name, None)
+
+
+def first_page_text(text):
+    """
+    Find the text of the first page that has any
+
+    Page markers are left out, so pages the PDF extraction module skipped,
+    which consist of a marker only, are passed over.
+
+    Args:
+        text (str): Extracted invoice text
+
+    Returns:
+        str: Text of the first page with text, or "" if there is none
+    """
+    for page_text in PAGE_MARKER_PATTERN.split(text):
+        if page_text.strip():
+            return page_text
+    return ""
+
+
+def detect_vendor(text):
+    """
+    Identify the supplier of an invoice from the start of its first page with text
+
+    Args:
+        text (str): Extracted invoice text
+
+    Returns:
+        str: Name of the first matching vendor, or GENERIC_VENDOR
+    """
+    first_page = first_page_text(text)[:FINGERPRINT_WINDOW]
+
+    for name, (fingerprint, _, _) in VENDORS.items():
+        if fingerprint.search(first_page):
+            return name
+    return GENERIC_VENDOR
+
+
+def get_line_parser(vendor):
+    """
+    Look up the line parser registered for a vendor
+
+    Args:
+        vendor (str): Vendor name
+
+    Returns:
+        function: Line parser, or None for the generic vendor or unknown names
+    """
+    entry = VENDORS.get(vendor)
+    return entry[1] if entry else None
+
+
+def uses_generic_fallback(vendor):
+    """
+    Check whether item lines rejected by a vendor's parser go to the generic parser
+
+    Args:
+        vendor (str): Vendor name
+
+    Returns:
+        bool: True for vendors registered with fallback and for the generic vendor
+    """
+    entry = VENDORS.get(vendor)
+    return entry[2] if entry else True
@@ -0,0 +1,59 @@
+"""
+Tests for the Binder1 line parser and vendor detection
+"""
+import json
+import os
+
+import pytest
+
+from src.text_processing.processor import (
+    BINDER1_VENDOR, parse_binder1_line, parse_generic_line, parse_invoice_text,
+)
+from src.text_processing.vendors import GENERIC_VENDOR, detect_vendor, first_page_text
+
+# Lines from Binder1.pdf, OCR-garbled variants of them and synthetic invoice
+# rows, each with the item the parser produced before vendor routing existed
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'data', 'binder1_baseline.json')
+
+with open(BASELINE_PATH, encoding='utf-8') as f:
+    BASELINE_CASES = json.load(f)
+
+# Start of page 1 of Binder1.pdf as the PDF extraction module reports it
+BINDER1_HEADER = """RECEIVING HOURS Mon-Fri,11AM - 6PM
+SOLD INTERNATIONAL FOOD BAZAAR
+*** COPY *** 0321163*
+"""
+
+
+@pytest.mark.parametrize('case', BASELINE_CASES, ids=lambda case: case['line'])
+def test_binder1_parser_matches_baseline(case):
+    assert parse_binder1_line(case['line']) == case['expected']
+
+
+@pytest.mark.parametrize('case', BASELINE_CASES, ids=lambda case: case['line'])
+def test_generic_parser_keeps_binder1_rules(case):
+    assert parse_generic_line(case['line']) == case['expected']
+
+
+def test_detect_binder1_from_page_header():
+    text = "=== Page 1 (OCR, profile=default) ===\n" + BINDER1_HEADER
+    assert detect_vendor(text) == BINDER1_VENDOR
+
+
+def test_detect_binder1_after_skipped_page():
+    text = "=== Page 1 (SKIPPED: OCR timed out) ===\n\n=== Page 2 ===\n" + BINDER1_HEADER
+    assert first_page_text(text).strip().startswith("RECEIVING HOURS")
+    assert detect_vendor(text) == BINDER1_VENDOR
+
+
+def test_detect_generic_without_fingerprint():
+    text = "=== Page 1 ===\nACME FOODS\n2 2 CAS 15 Deep F S Samosa (24) 62.80 125.60\n"
+    assert detect_vendor(text) == GENERIC_VENDOR
+
+
+def test_binder1_page_items():
+    lines = [case['line'] for case in BASELINE_CASES[:10]]
+    text = "=== Page 1 ===\n" + BINDER1_HEADER + "\n".join(lines) + "\n"
+    expected = [case['expected'] for case in BASELINE_CASES[:10] if case['expected']]
+    items = parse_invoice_text(text)
+    assert [{k: v for k, v in item.items() if k not in ('Page', 'OcrProfile')} for item in items] == expected